@@ -1,17 +1,45 @@
 """LangGraph-based MCP agent orchestration."""
 
 from typing import TypedDict, Annotated, Literal
+from uuid import uuid4
+from langgraph.checkpoint.base import CheckpointTuple
 from langgraph.graph import StateGraph, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.types import Send
 from pydantic import BaseModel, Field
-import operator
+
+from .checkpointer import create_checkpointer
+from .context_pruning import prune_if_needed
+
+
+# Token budget for conversation history carried in checkpointed state
+HISTORY_MAX_TOKENS = 2000
+
+
+def _append_history(history: list[dict], new_messages: list[dict]) -> list[dict]:
+    """Append new turns to the history and compact it once over budget.
+
+    Older turns are folded into a summary entry by ContextPruner, so both
+    checkpoint size and per-turn LLM input stay bounded as threads grow.
+    """
+    return prune_if_needed(history + new_messages, max_tokens=HISTORY_MAX_TOKENS)
+
+
+def _merge_results(current: dict | None, update: dict | None) -> dict | None:
+    """Merge partial diagnostic results written by parallel branches.
+
+    A None update clears the results, so each new run starts from scratch
+    instead of inheriting the previous turn's checkpointed findings.
+    """
+    if update is None:
+        return None
+    return {**(current or {}), **update}
 
 
 class AgentState(TypedDict):
     """State for the MCP management agent."""
     # User input
     user_request: str
-    conversation_history: Annotated[list[dict], operator.add]
+    conversation_history: Annotated[list[dict], _append_history]
 
     # Current task
     current_task: str
@@ -24,7 +52,7 @@ class AgentState(TypedDict):
     server_status: dict | None
 
     # Analysis results
-    diagnostic_results: dict | None
+    diagnostic_results: Annotated[dict | None, _merge_results]
     test_results: dict | None
     config_changes: dict | None
 
@@ -58,16 +86,26 @@ class AgentOutput(BaseModel):
 class MCPAgentGraph:
     """LangGraph-based agent for MCP server management."""
 
-    def __init__(self, tools_registry: dict):
+    def __init__(
+        self,
+        tools_registry: dict,
+        postgres_url: str | None = None,
+        use_postgres: bool = False,
+        sqlite_path: str | None = None
+    ):
         """
         Initialize the agent graph.
 
         Args:
             tools_registry: Dictionary of tool instances
+            postgres_url: PostgreSQL connection string
+            use_postgres: Enable PostgreSQL checkpointer
+            sqlite_path: SQLite database file for the checkpointer
         """
         self.tools = tools_registry
+        # The checkpointer must exist before the graph is compiled against it
+        self.memory = create_checkpointer(postgres_url, use_postgres, sqlite_path)
         self.graph = self._build_graph()
-        self.memory = MemorySaver()
 
     def _build_graph(self) -> StateGraph:
         """Build the LangGraph state machine."""
@@ -76,7 +114,9 @@ class MCPAgentGraph:
         # Add nodes for each state
         workflow.add_node("analyze_request", self._analyze_request)
         workflow.add_node("check_server_status", self._check_server_status)
-        workflow.add_node("diagnose", self._diagnose)
+        workflow.add_node("diagnose_logs", self._diagnose_logs)
+        workflow.add_node("diagnose_connection", self._diagnose_connection)
+        workflow.add_node("diagnose_tools", self._diagnose_tools)
         workflow.add_node("test", self._test)
         workflow.add_node("configure", self._configure)
         workflow.add_node("install", self._install)
@@ -94,7 +134,6 @@ class MCPAgentGraph:
             self._route_after_analysis,
             {
                 "check_status": "check_server_status",
-                "diagnose": "diagnose",
                 "test": "test",
                 "configure": "configure",
                 "install": "install",
@@ -102,8 +141,13 @@ class MCPAgentGraph:
             }
         )
 
-        workflow.add_edge("check_server_status", "diagnose")
-        workflow.add_edge("diagnose", "suggest_fixes")
+        # Diagnostic checks are independent, so fan them out in parallel and
+        # join on suggest_fixes once all three branches have reported
+        diagnostic_nodes = ["diagnose_logs", "diagnose_connection", "diagnose_tools"]
+        workflow.add_conditional_edges(
+            "check_server_status", self._fan_out_diagnostics, diagnostic_nodes
+        )
+        workflow.add_edge(diagnostic_nodes, "suggest_fixes")
         workflow.add_edge("test", "report")
         workflow.add_edge("configure", "report")
         workflow.add_edge("install", "monitor")
@@ -133,92 +177,88 @@ class MCPAgentGraph:
 
         return workflow.compile(checkpointer=self.memory)
 
-    async def _analyze_request(self, state: AgentState) -> AgentState:
+    async def _analyze_request(self, state: AgentState) -> dict:
         """Analyze the user's request and determine task type."""
         request = state["user_request"].lower()
 
         # Simple keyword-based routing (would use LLM in production)
         if any(word in request for word in ["debug", "diagnose", "error", "failing"]):
-            state["task_type"] = "diagnose"
-            state["current_task"] = "Diagnosing server issues"
+            update = {"task_type": "diagnose", "current_task": "Diagnosing server issues"}
         elif any(word in request for word in ["test", "check", "validate"]):
-            state["task_type"] = "test"
-            state["current_task"] = "Testing server functionality"
+            update = {"task_type": "test", "current_task": "Testing server functionality"}
         elif any(word in request for word in ["configure", "config", "settings"]):
-            state["task_type"] = "configure"
-            state["current_task"] = "Managing configuration"
+            update = {"task_type": "configure", "current_task": "Managing configuration"}
         elif any(word in request for word in ["install", "add", "new server"]):
-            state["task_type"] = "install"
-            state["current_task"] = "Installing new server"
+            update = {"task_type": "install", "current_task": "Installing new server"}
         else:
-            state["task_type"] = "monitor"
-            state["current_task"] = "Monitoring server status"
+            update = {"task_type": "monitor", "current_task": "Monitoring server status"}
 
-        # Extract server name if mentioned
+        # Keep an explicitly requested server, else extract one if mentioned
         # In production, would use NER or LLM extraction
-        state["target_server"] = self._extract_server_name(request)
+        if not state.get("target_server"):
+            update["target_server"] = self._extract_server_name(request)
 
-        return state
+        return update
 
-    async def _check_server_status(self, state: AgentState) -> AgentState:
+    async def _check_server_status(self, state: AgentState) -> dict:
         """Check the status of the target server."""
         if not state["target_server"]:
-            state["error"] = "No target server specified"
-            return state
+            return {"error": "No target server specified"}
 
         # Use diagnostic tools to get server status
         diagnostic_tools = self.tools["diagnostic"]
         status = await diagnostic_tools.identify_connection_issues(state["target_server"])
 
-        state["server_status"] = status.model_dump()
-        return state
+        return {"server_status": status.model_dump()}
 
-    async def _diagnose(self, state: AgentState) -> AgentState:
-        """Diagnose server issues."""
-        diagnostic_tools = self.tools["diagnostic"]
+    def _fan_out_diagnostics(self, state: AgentState) -> list[Send]:
+        """Dispatch the diagnostic checks to run concurrently."""
+        return [
+            Send("diagnose_logs", state),
+            Send("diagnose_connection", state),
+            Send("diagnose_tools", state),
+        ]
 
-        # Analyze logs
-        log_analysis = await diagnostic_tools.analyze_server_logs(
+    async def _diagnose_logs(self, state: AgentState) -> dict:
+        """Analyze recent server logs."""
+        log_analysis = await self.tools["diagnostic"].analyze_server_logs(
             state["target_server"],
             time_range="1h"
         )
+        return {"diagnostic_results": {"log_analysis": log_analysis.model_dump()}}
 
-        # Check connection
-        connection_status = await diagnostic_tools.identify_connection_issues(
+    async def _diagnose_connection(self, state: AgentState) -> dict:
+        """Check the server connection."""
+        connection_status = await self.tools["diagnostic"].identify_connection_issues(
             state["target_server"]
         )
+        return {
+            "diagnostic_results": {"connection_status": connection_status.model_dump()}
+        }
 
-        # Analyze tool failures
-        tool_analysis = await diagnostic_tools.analyze_tool_failures(
+    async def _diagnose_tools(self, state: AgentState) -> dict:
+        """Analyze tool failures."""
+        tool_analysis = await self.tools["diagnostic"].analyze_tool_failures(
             state["target_server"]
         )
+        return {"diagnostic_results": {"tool_analysis": tool_analysis.model_dump()}}
 
-        state["diagnostic_results"] = {
-            "log_analysis": log_analysis.model_dump(),
-            "connection_status": connection_status.model_dump(),
-            "tool_analysis": tool_analysis.model_dump(),
-        }
-
-        return state
-
-    async def _test(self, state: AgentState) -> AgentState:
+    async def _test(self, state: AgentState) -> dict:
         """Test server functionality."""
         # Would use testing tools
-        state["test_results"] = {"status": "passed", "tests_run": 0}
-        return state
+        return {"test_results": {"status": "passed", "tests_run": 0}}
 
-    async def _configure(self, state: AgentState) -> AgentState:
+    async def _configure(self, state: AgentState) -> dict:
         """Manage server configuration."""
         # Would use config tools
-        state["config_changes"] = {}
-        return state
+        return {"config_changes": {}}
 
-    async def _install(self, state: AgentState) -> AgentState:
+    async def _install(self, state: AgentState) -> dict:
         """Install new server."""
         # Would use discovery tools
-        return state
+        return {}
 
-    async def _suggest_fixes(self, state: AgentState) -> AgentState:
+    async def _suggest_fixes(self, state: AgentState) -> dict:
         """Generate fix suggestions based on diagnostic results."""
         diagnostic_tools = self.tools["diagnostic"]
 
@@ -226,32 +266,30 @@ class MCPAgentGraph:
             state["diagnostic_results"]
         )
 
-        state["suggested_fixes"] = [fix.model_dump() for fix in fixes]
-        state["requires_approval"] = any(fix.requires_approval for fix in fixes)
-
-        return state
+        return {
+            "suggested_fixes": [fix.model_dump() for fix in fixes],
+            "requires_approval": any(fix.requires_approval for fix in fixes),
+        }
 
-    async def _await_approval(self, state: AgentState) -> AgentState:
+    async def _await_approval(self, state: AgentState) -> dict:
         """Wait for user approval of suggested fixes."""
         # In production, this would pause execution and wait for user input
         # For now, we'll just mark it as requiring approval
-        state["approval_granted"] = False  # User must explicitly approve
-        return state
+        return {"approval_granted": False}  # User must explicitly approve
 
-    async def _execute_fixes(self, state: AgentState) -> AgentState:
+    async def _execute_fixes(self, state: AgentState) -> dict:
         """Execute approved fixes."""
         # Would execute the approved fixes
-        return state
+        return {}
 
-    async def _monitor(self, state: AgentState) -> AgentState:
+    async def _monitor(self, state: AgentState) -> dict:
         """Monitor server after changes."""
         # Would monitor server health
-        return state
+        return {}
 
-    async def _report(self, state: AgentState) -> AgentState:
+    async def _report(self, state: AgentState) -> dict:
         """Generate final report."""
-        state["completed"] = True
-        return state
+        return {"completed": True}
 
     def _route_after_analysis(self, state: AgentState) -> str:
         """Route to appropriate node after analysis."""
@@ -294,17 +332,63 @@ class MCPAgentGraph:
                 return words[i + 1].strip(",.:;")
         return None
 
-    async def run(self, user_input: AgentInput) -> AgentOutput:
+    async def run(self, user_input: AgentInput, thread_id: str | None = None) -> AgentOutput:
         """
         Run the agent on a user request.
 
         Args:
             user_input: User's request and parameters
+            thread_id: Thread ID for session persistence; pass the same ID to
+                continue a conversation (default: a new thread for this call)
 
         Returns:
             AgentOutput with response and actions
         """
-        initial_state: AgentState = {
+        if thread_id is None:
+            thread_id = uuid4().hex
+        config = {"configurable": {"thread_id": thread_id}}
+
+        # Run the graph
+        final_state = await self.graph.ainvoke(self._initial_state(user_input), config)
+
+        # Build response
+        response = self._build_response(final_state)
+
+        return response
+
+    async def run_batch(
+        self,
+        user_inputs: list[AgentInput],
+        thread_ids: list[str] | None = None
+    ) -> list[AgentOutput]:
+        """
+        Run the agent on several independent requests concurrently.
+
+        Args:
+            user_inputs: Requests to run
+            thread_ids: One thread ID per request (default: a new thread for
+                each); threads must be distinct since the runs execute
+                concurrently
+
+        Returns:
+            AgentOutput for each request, in input order
+        """
+        if thread_ids is None:
+            thread_ids = [uuid4().hex for _ in user_inputs]
+        if len(thread_ids) != len(user_inputs):
+            raise ValueError("thread_ids must match user_inputs in length")
+
+        configs = [{"configurable": {"thread_id": thread_id}} for thread_id in thread_ids]
+        final_states = await self.graph.abatch(
+            [self._initial_state(user_input) for user_input in user_inputs],
+            configs
+        )
+
+        return [self._build_response(state) for state in final_states]
+
+    def _initial_state(self, user_input: AgentInput) -> AgentState:
+        """Build the graph input for a user request."""
+        return {
             "user_request": user_input.request,
             "conversation_history": [{"role": "user", "content": user_input.request}],
             "current_task": "",
@@ -322,13 +406,21 @@ class MCPAgentGraph:
             "completed": False,
         }
 
-        # Run the graph
-        final_state = await self.graph.ainvoke(initial_state)
+    async def get_latest_checkpoint(self, thread_id: str) -> CheckpointTuple | None:
+        """
+        Fetch the most recent checkpoint for a thread.
 
-        # Build response
-        response = self._build_response(final_state)
+        Reads only the head checkpoint instead of listing the thread's full
+        history.
 
-        return response
+        Args:
+            thread_id: Thread ID used for session persistence
+
+        Returns:
+            Latest CheckpointTuple, or None if the thread has no checkpoints
+        """
+        config = {"configurable": {"thread_id": thread_id}}
+        return await self.memory.aget_tuple(config)
 
     def _build_response(self, state: AgentState) -> AgentOutput:
         """Build the output response from final state."""
@@ -7,11 +7,70 @@ Implements the same strategy as Go LLMAgent:
 4. Preserve important context markers (config changes, errors)
 """
 
+import functools
 import logging
-from typing import List, Dict
+import re
+from typing import List, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+# Optional tiktoken support - exact BPE token counts when available
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Distinct message contents whose BPE token counts are memoized
+TOKEN_CACHE_SIZE = 8192
+
+# Important keywords (matching Go implementation), matched as substrings in
+# one case-insensitive scan. "config" also covers "configuration".
+_IMPORTANT_RE = re.compile(
+    r"error|failed|warning|critical|config|server|status|changed|updated",
+    re.IGNORECASE
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_encoding() -> Optional["tiktoken.Encoding"]:
+    """Load the cl100k_base encoding, or None when tiktoken is unusable."""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        logger.warning("tiktoken encoding unavailable, estimating tokens from length")
+        return None
+
+
+@functools.lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _count_bpe_tokens(text: str) -> int:
+    """Count BPE tokens; repeated contents (system prompts, tool output) hit the cache."""
+    return len(_get_encoding().encode_ordinary(text))
+
+
+def count_content_tokens(text: str) -> int:
+    """
+    Count tokens in message content.
+
+    Uses tiktoken's cl100k_base encoding when installed, otherwise the
+    Go implementation's heuristic of ~4 characters per token.
+
+    Args:
+        text: Message content
+
+    Returns:
+        Token count for the content
+    """
+    if _get_encoding() is None:
+        return len(text) // 4
+    return _count_bpe_tokens(text)
+
+
+# Message keys carrying tool call payloads, dropped from older messages
+_TOOL_DETAIL_KEYS = frozenset({"tool_calls", "tool_call_details"})
+
 
 class ContextPruner:
     """Intelligent conversation context pruning."""
@@ -93,7 +152,7 @@ class ContextPruner:
             # If middle messages fit, keep them all
             if sum(middle_tokens) <= available_for_middle:
                 for msg, tokens in zip(middle_messages, middle_tokens):
-                    pruned_messages.append(msg)
+                    pruned_messages.append(self._strip_tool_details(msg))
                     current_tokens += tokens
                 logger.debug(
                     f"Kept all {len(middle_messages)} middle messages: {sum(middle_tokens)} tokens"
@@ -105,7 +164,7 @@ class ContextPruner:
                 )
 
                 for msg, tokens in important_middle:
-                    pruned_messages.append(msg)
+                    pruned_messages.append(self._strip_tool_details(msg))
                     current_tokens += tokens
 
                 logger.debug(
@@ -125,8 +184,9 @@ class ContextPruner:
             pruned_messages.append(messages[i])
             current_tokens += message_tokens[i]
 
-        # Log pruning results
-        new_total_tokens = sum(self._estimate_tokens(msg) for msg in pruned_messages)
+        # Log pruning results; current_tokens already tracks every kept
+        # message, so nothing is re-estimated here
+        new_total_tokens = current_tokens
         tokens_saved = total_tokens - new_total_tokens
 
         logger.info(
@@ -142,8 +202,8 @@ class ContextPruner:
         """
         Estimate token count for a message.
 
-        Uses a simple heuristic: ~4 characters per token
-        This matches the Go implementation's estimation.
+        Counts content tokens with tiktoken when installed; otherwise uses
+        the Go implementation's heuristic of ~4 characters per token.
 
         Args:
             message: Message dictionary
@@ -153,17 +213,27 @@ class ContextPruner:
         """
         content = str(message.get("content", ""))
 
-        # Count characters in content
-        char_count = len(content)
-
         # Add tokens for role and metadata
         role_tokens = 5  # Fixed overhead for role, metadata
 
-        # Estimate: ~4 characters per token (English text average)
-        estimated_tokens = (char_count // 4) + role_tokens
+        estimated_tokens = count_content_tokens(content) + role_tokens
 
         return max(estimated_tokens, 10)  # Minimum 10 tokens per message
 
+    def _strip_tool_details(self, message: Dict) -> Dict:
+        """
+        Drop tool call payloads from an older message.
+
+        Args:
+            message: Message dictionary
+
+        Returns:
+            The message itself, or a copy without tool call keys
+        """
+        if _TOOL_DETAIL_KEYS.isdisjoint(message):
+            return message
+        return {k: v for k, v in message.items() if k not in _TOOL_DETAIL_KEYS}
+
     def _is_system_message(self, message: Dict) -> bool:
         """
         Check if message is a system message.
@@ -192,23 +262,7 @@ class ContextPruner:
         Returns:
             True if message is important
         """
-        content = str(message.get("content", "")).lower()
-
-        # Important keywords (matching Go implementation)
-        important_keywords = [
-            "error",
-            "failed",
-            "warning",
-            "critical",
-            "configuration",
-            "config",
-            "server",
-            "status",
-            "changed",
-            "updated",
-        ]
-
-        return any(keyword in content for keyword in important_keywords)
+        return _IMPORTANT_RE.search(str(message.get("content", ""))) is not None
 
     def _filter_important_messages(
         self,
@@ -1,5 +1,6 @@
 """LangGraph-based semantic search agent for intelligent tool discovery."""
 
+import asyncio
 from typing import TypedDict, Literal, List, Optional
 from langgraph.graph import StateGraph, END
 from pydantic import BaseModel, Field
@@ -55,7 +56,8 @@ class SemanticSearchAgent:
         self,
         semantic_tools,
         postgres_url: Optional[str] = None,
-        use_postgres: bool = False
+        use_postgres: bool = False,
+        sqlite_path: Optional[str] = None
     ):
         """Initialize semantic search agent.
 
@@ -63,9 +65,10 @@ class SemanticSearchAgent:
             semantic_tools: SemanticSearchTools instance
             postgres_url: PostgreSQL connection string
             use_postgres: Enable PostgreSQL checkpointer
+            sqlite_path: SQLite database file for the checkpointer
         """
         self.semantic_tools = semantic_tools
-        self.memory = create_checkpointer(postgres_url, use_postgres)
+        self.memory = create_checkpointer(postgres_url, use_postgres, sqlite_path)
         self.graph = self._build_graph()
 
         # Log checkpointer configuration
@@ -287,3 +290,27 @@ class SemanticSearchAgent:
             reasoning=final_state.get("reasoning", ""),
             mode=final_state.get("search_mode", request.mode)
         )
+
+    async def search_many(
+        self,
+        requests: List[SearchRequest],
+        thread_ids: List[str]
+    ) -> List[SearchResponse]:
+        """Execute several searches concurrently.
+
+        All queries are embedded in one model call up front, so each search
+        finds its query embedding already cached.
+
+        Args:
+            requests: Search requests
+            thread_ids: Thread ID for each request
+
+        Returns:
+            Search responses in request order
+        """
+        self.semantic_tools.prime_query_cache([request.query for request in requests])
+
+        return list(await asyncio.gather(*(
+            self.search(request, thread_id=thread_id)
+            for request, thread_id in zip(requests, thread_ids)
+        )))
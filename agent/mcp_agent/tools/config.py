@@ -5,6 +5,8 @@ from pydantic import BaseModel, Field
 from datetime import datetime
 import httpx
 
+from .http_client import get_http_client
+
 
 class ServerConfig(BaseModel):
     """MCP server configuration."""
@@ -47,12 +49,18 @@ class BackupResult(BaseModel):
 class ConfigTools:
     """Tools for managing MCP server configurations."""
 
-    def __init__(self, base_url: str = "http://localhost:8080", api_token: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8080",
+        api_token: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None
+    ):
         self.base_url = base_url
         self.headers = {}
         if api_token:
             self.headers["Authorization"] = f"Bearer {api_token}"
-        self.client = httpx.AsyncClient(base_url=base_url, headers=self.headers)
+        # Shared pooled client; auth headers are sent per request
+        self.client = client or get_http_client()
 
     async def read_server_config(self, server_name: str) -> ServerConfig:
         """
@@ -64,7 +72,10 @@ class ConfigTools:
         Returns:
             ServerConfig with current configuration
         """
-        response = await self.client.get(f"/api/v1/agent/servers/{server_name}/config")
+        response = await self.client.get(
+            f"{self.base_url}/api/v1/agent/servers/{server_name}/config",
+            headers=self.headers,
+        )
         response.raise_for_status()
         config_data = response.json()
 
@@ -103,8 +114,9 @@ class ConfigTools:
 
         # Apply updates
         response = await self.client.patch(
-            f"/api/v1/agent/servers/{server_name}/config",
+            f"{self.base_url}/api/v1/agent/servers/{server_name}/config",
             json=updates,
+            headers=self.headers,
         )
         response.raise_for_status()
         new_config = response.json()
@@ -170,12 +182,12 @@ class ConfigTools:
         Returns:
             BackupResult with backup information
         """
-        endpoint = "/api/v1/agent/config/backup"
+        endpoint = f"{self.base_url}/api/v1/agent/config/backup"
         params = {}
         if server_name:
             params["server"] = server_name
 
-        response = await self.client.post(endpoint, params=params)
+        response = await self.client.post(endpoint, params=params, headers=self.headers)
         response.raise_for_status()
         result = response.json()
 
@@ -192,8 +204,9 @@ class ConfigTools:
             ConfigUpdateResult with restoration status
         """
         response = await self.client.post(
-            "/api/v1/agent/config/restore",
+            f"{self.base_url}/api/v1/agent/config/restore",
             json={"backup_id": backup_id},
+            headers=self.headers,
         )
         response.raise_for_status()
         result = response.json()
@@ -7,6 +7,8 @@ from pydantic_ai import Agent, RunContext
 import httpx
 from enum import Enum
 
+from .http_client import get_http_client
+
 
 class SeverityLevel(str, Enum):
     """Error severity levels."""
@@ -69,12 +71,18 @@ class Fix(BaseModel):
 class MCPProxyClient:
     """HTTP client for mcpproxy API."""
 
-    def __init__(self, base_url: str = "http://localhost:8080", api_token: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8080",
+        api_token: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None
+    ):
         self.base_url = base_url
         self.headers = {}
         if api_token:
             self.headers["Authorization"] = f"Bearer {api_token}"
-        self.client = httpx.AsyncClient(base_url=base_url, headers=self.headers)
+        # Shared pooled client; auth headers are sent per request
+        self.client = client or get_http_client()
 
     async def get_server_logs(
         self,
@@ -88,15 +96,19 @@ class MCPProxyClient:
             params["filter"] = filter_pattern
 
         response = await self.client.get(
-            f"/api/v1/agent/servers/{server_name}/logs",
-            params=params
+            f"{self.base_url}/api/v1/agent/servers/{server_name}/logs",
+            params=params,
+            headers=self.headers
         )
         response.raise_for_status()
         return response.json()
 
     async def get_server_status(self, server_name: str) -> Dict[str, Any]:
         """Get server status."""
-        response = await self.client.get(f"/api/v1/agent/servers/{server_name}")
+        response = await self.client.get(
+            f"{self.base_url}/api/v1/agent/servers/{server_name}",
+            headers=self.headers
+        )
         response.raise_for_status()
         return response.json()
 
@@ -110,7 +122,11 @@ class MCPProxyClient:
         if filter_pattern:
             params["filter"] = filter_pattern
 
-        response = await self.client.get("/api/v1/agent/logs/main", params=params)
+        response = await self.client.get(
+            f"{self.base_url}/api/v1/agent/logs/main",
+            params=params,
+            headers=self.headers
+        )
         response.raise_for_status()
         return response.json()
 
@@ -4,6 +4,8 @@ import httpx
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel
 
+from .http_client import get_http_client
+
 
 class MCPServerInfo(BaseModel):
     """Information about an MCP server from registry."""
@@ -41,14 +43,19 @@ class SearchResult(BaseModel):
 class DiscoveryTools:
     """Tools for discovering and installing MCP servers."""
 
-    def __init__(self, base_url: str = "http://localhost:8080"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8080",
+        client: Optional[httpx.AsyncClient] = None
+    ):
         """Initialize discovery tools.
 
         Args:
             base_url: Base URL for mcpproxy agent API
+            client: HTTP client to use (defaults to the shared pooled client)
         """
         self.base_url = base_url
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.client = client or get_http_client()
 
     async def search_mcp_registries(
         self,
@@ -204,5 +211,8 @@ class DiscoveryTools:
         return result.results
 
     async def close(self):
-        """Close HTTP client."""
-        await self.client.aclose()
+        """Release the HTTP client.
+
+        The client is shared or injected and closed by its owner, so there
+        is nothing to release here.
+        """
@@ -6,6 +6,8 @@ from pydantic import BaseModel
 from bs4 import BeautifulSoup
 import re
 
+from .http_client import get_http_client
+
 
 class DocumentationResult(BaseModel):
     """Documentation search result."""
@@ -28,14 +30,19 @@ class ToolDocumentation(BaseModel):
 class DocumentationTools:
     """Tools for searching and retrieving documentation."""
 
-    def __init__(self, base_url: str = "http://localhost:8080"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8080",
+        client: Optional[httpx.AsyncClient] = None
+    ):
         """Initialize documentation tools.
 
         Args:
             base_url: Base URL for mcpproxy agent API
+            client: HTTP client to use (defaults to the shared pooled client)
         """
         self.base_url = base_url
-        self.client = httpx.AsyncClient(timeout=30.0, follow_redirects=True)
+        self.client = client or get_http_client()
 
         # Common MCP documentation sources
         self.mcp_docs_urls = {
@@ -173,7 +180,7 @@ class DocumentationTools:
             Documentation content
         """
         try:
-            response = await self.client.get(url)
+            response = await self.client.get(url, follow_redirects=True)
             response.raise_for_status()
 
             content = response.text
@@ -317,5 +324,8 @@ class DocumentationTools:
         return results[:limit]
 
     async def close(self):
-        """Close HTTP client."""
-        await self.client.aclose()
+        """Release the HTTP client.
+
+        The client is shared or injected and closed by its owner, so there
+        is nothing to release here.
+        """
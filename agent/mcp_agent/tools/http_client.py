@@ -0,0 +1,68 @@
+"""Shared HTTP client for the mcpproxy API.
+
+All tool classes talk to the same mcpproxy host, so they share one pooled
+AsyncClient instead of warming up a connection pool per instance.
+"""
+
+import importlib.util
+from typing import Any, Optional
+
+import httpx
+
+# Optional orjson support - decodes response bodies faster than stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# HTTP/2 needs the optional h2 package (httpx[http2]). It is negotiated via
+# ALPN, so it applies to https:// endpoints; plain http:// stays on HTTP/1.1
+# keep-alive connections from the same pool.
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=200,
+    max_keepalive_connections=100,
+    keepalive_expiry=30.0
+)
+DEFAULT_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the process-wide pooled HTTP client.
+
+    The client is created on first use and recreated if a previous holder
+    closed it. Long-running services own its lifecycle and close it on
+    shutdown.
+
+    Returns:
+        Shared httpx.AsyncClient instance
+    """
+    global _shared_client
+
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=DEFAULT_LIMITS,
+            timeout=DEFAULT_TIMEOUT
+        )
+
+    return _shared_client
+
+
+def decode_json(response: httpx.Response) -> Any:
+    """Decode a JSON response body, using orjson when it is installed.
+
+    Args:
+        response: Response with a JSON body
+
+    Returns:
+        Decoded JSON value
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
@@ -7,6 +7,8 @@ from pydantic import BaseModel
 from datetime import datetime
 from collections import Counter
 
+from .http_client import get_http_client
+
 
 class LogEntry(BaseModel):
     """Structured log entry."""
@@ -42,14 +44,19 @@ class LogQueryResult(BaseModel):
 class LogTools:
     """Tools for reading and analyzing logs."""
 
-    def __init__(self, base_url: str = "http://localhost:8080"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8080",
+        client: Optional[httpx.AsyncClient] = None
+    ):
         """Initialize log tools.
 
         Args:
             base_url: Base URL for mcpproxy agent API
+            client: HTTP client to use (defaults to the shared pooled client)
         """
         self.base_url = base_url
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.client = client or get_http_client()
 
     async def read_main_logs(
         self,
@@ -347,5 +354,8 @@ class LogTools:
         return summary
 
     async def close(self):
-        """Close HTTP client."""
-        await self.client.aclose()
+        """Release the HTTP client.
+
+        The client is shared or injected and closed by its owner, so there
+        is nothing to release here.
+        """
@@ -23,7 +23,10 @@ class MemoryTools:
         Returns:
             MemoryContent object containing the markdown content.
         """
-        response = await self.client.client.get("/api/memory")
+        response = await self.client.client.get(
+            f"{self.client.base_url}/api/memory",
+            headers=self.client.headers
+        )
         response.raise_for_status()
         data = response.json()
         return MemoryContent(**data)
@@ -39,8 +42,9 @@ class MemoryTools:
             MemoryContent object with success status.
         """
         response = await self.client.client.post(
-            "/api/memory", 
-            json={"content": content}
+            f"{self.client.base_url}/api/memory",
+            json={"content": content},
+            headers=self.client.headers
         )
         response.raise_for_status()
         data = response.json()
@@ -9,12 +9,40 @@ Provides semantic search capabilities with:
 
 import chromadb
 from chromadb.config import Settings
-import httpx
+from collections import OrderedDict
+from contextlib import suppress
+from dataclasses import asdict, dataclass, field
+import functools
+import glob
+import hashlib
+import json
+import logging
+import numpy as np
 import os
-from typing import List, Optional, Dict, Any
+import time
+import torch
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 from pydantic import BaseModel, Field
 from sentence_transformers import SentenceTransformer
 
+from .http_client import get_http_client
+
+# Optional hnswlib support - approximate search for large tool stores
+try:
+    import hnswlib
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    HNSWLIB_AVAILABLE = False
+
+# Optional numba support - scores int8 matrices without upcasting them
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
 
 class ServerSummary(BaseModel):
     """MCP server documentation summary."""
@@ -36,6 +64,373 @@ class ToolCandidate(BaseModel):
     reasoning: str = Field(default="", description="Selection reasoning")
 
 
+@dataclass(slots=True)
+class _CandidateRaw:
+    """Internal, validation-free tool candidate used while reranking."""
+    tool_name: str
+    server_name: str
+    description: str
+    similarity_score: float
+    context_score: float
+    final_score: float
+    reasoning: str = ""
+    input_schema: Dict[str, Any] = field(default_factory=dict)
+
+    def to_public(self) -> ToolCandidate:
+        """Build the public model without re-running Pydantic validation."""
+        return ToolCandidate.model_construct(**asdict(self))
+
+
+# Rows upcast per block when scoring a reduced-precision matrix
+_SCORE_BLOCK_ROWS = 4096
+
+# int8 quantization scale for L2-normalized embeddings (components in [-1, 1])
+_INT8_SCALE = 127.0
+
+# Query embeddings kept per SemanticSearchTools instance
+QUERY_CACHE_SIZE = 1024
+
+# Texts per forward pass when encoding in bulk
+_ENCODE_BATCH_SIZE = 64
+
+# Maximum records per ChromaDB upsert during bulk sync
+_UPSERT_BATCH_SIZE = 1000
+
+# Tools embedded and written per step while syncing from mcpproxy
+_SYNC_BATCH_SIZE = 128
+
+# Collection metadata key bumped on every write, so processes sharing the
+# ChromaDB directory can tell their loaded matrix is stale
+_GENERATION_KEY = "generation"
+
+# Minimum seconds between checks of a loaded matrix against its collection
+_FRESHNESS_CHECK_INTERVAL = 1.0
+
+# Collections at least this large are searched through an HNSW graph
+HNSW_MIN_ROWS = 20000
+
+# HNSW graph degree and build/query beam widths
+_HNSW_M = 16
+_HNSW_EF_CONSTRUCTION = 200
+_HNSW_MIN_EF = 50
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _int8_scores(matrix, query):
+        """Inner product of every int8 row with a float32 query, row-parallel."""
+        n, dim = matrix.shape
+        scores = np.empty(n, dtype=np.float32)
+        for i in prange(n):
+            acc = np.float32(0.0)
+            for k in range(dim):
+                acc += np.float32(matrix[i, k]) * query[k]
+            scores[i] = acc
+        return scores
+
+
+def _records_fingerprint(
+    ids: List[str],
+    documents: Optional[List[str]],
+    metadatas: Optional[List[Dict[str, Any]]]
+) -> str:
+    """Digest a collection's records independently of their order.
+
+    Embeddings are derived from the documents, so ids, documents and
+    metadata identify a snapshot's contents without hashing the vectors.
+    """
+    documents = documents if documents is not None else [None] * len(ids)
+    metadatas = metadatas if metadatas is not None else [None] * len(ids)
+    digest = hashlib.sha256()
+    for record in sorted(zip(ids, documents, metadatas), key=lambda r: r[0]):
+        digest.update(json.dumps(record, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class _EmbeddingMatrix:
+    """Dense in-memory copy of a ChromaDB collection for exact search.
+
+    At our scale (<100 servers, <10k tools) a single matrix-vector product
+    over L2-normalized embeddings beats an ANN query, so ChromaDB is only
+    used for persistence. Every write bumps a generation counter in the
+    collection metadata; searches compare it and the row count with the
+    values seen at load (at most once per _FRESHNESS_CHECK_INTERVAL) and
+    reload the matrix when either changed, so writes from other instances
+    or processes are picked up too.
+
+    The matrix can be held in float16 or int8 to cut its memory footprint
+    to a half or a quarter. int8 rows are L2-normalized embeddings scaled
+    by 127 and rounded, which keeps cosine scores within about 0.01 of
+    float32. NumPy has no BLAS path for either type, so rows are upcast to
+    float32 block by block while scoring; float32 remains the fastest
+    option for small stores. With numba installed, int8 rows are instead
+    scored in place by a compiled kernel, skipping the upcast copies.
+
+    Once a collection reaches HNSW_MIN_ROWS and hnswlib is installed, an
+    HNSW graph is built alongside the matrix on load and queries traverse
+    it instead of scanning every row.
+
+    Given a snapshot path, each load from ChromaDB is also written out as a
+    raw matrix file plus JSON ids/metadata (and the HNSW graph, if any),
+    tagged with a fingerprint of the records' ids, documents and metadata.
+    A later load whose collection still has the same fingerprint maps the
+    matrix read-only with np.memmap instead of pulling every embedding out
+    of ChromaDB, so pages are read on demand and shared between processes.
+    Data files are named after the fingerprint and the JSON file that
+    points at them is replaced last, so readers never see a partial or
+    mismatched snapshot.
+    """
+
+    def __init__(
+        self,
+        chroma_client: Any,
+        collection: Any,
+        dtype: Any = np.float32,
+        snapshot_path: Optional[str] = None
+    ):
+        self.chroma_client = chroma_client
+        self.collection = collection
+        self.dtype = np.dtype(dtype)
+        self.snapshot_path = snapshot_path
+        self.ids: List[str] = []
+        self.metadatas: List[Dict[str, Any]] = []
+        self.matrix: Optional[np.ndarray] = None
+        self.graph: Optional[Any] = None
+        self._loaded_state: Optional[Tuple[int, str]] = None
+        self._checked_at = 0.0
+
+        # Compile the int8 kernel now rather than on the first query
+        if NUMBA_AVAILABLE and self.dtype == np.int8:
+            _int8_scores(np.zeros((1, 1), dtype=np.int8), np.zeros(1, dtype=np.float32))
+
+    def generation(self) -> str:
+        """Read the collection's current write generation.
+
+        The collection is fetched again because Collection.metadata is a
+        copy taken when the handle was created.
+        """
+        metadata = self.chroma_client.get_collection(self.collection.name).metadata
+        return str((metadata or {}).get(_GENERATION_KEY, ""))
+
+    def invalidate(self) -> None:
+        """Bump the collection's generation and drop the loaded matrix."""
+        metadata = self.chroma_client.get_collection(self.collection.name).metadata or {}
+        # hnsw:* settings are fixed at creation and may not be passed to modify()
+        metadata = {k: v for k, v in metadata.items() if not k.startswith("hnsw:")}
+        metadata[_GENERATION_KEY] = int(metadata.get(_GENERATION_KEY, 0)) + 1
+        self.collection.modify(metadata=metadata)
+
+        self.matrix = None
+        self.graph = None
+
+    def _ensure_current(self) -> None:
+        """Load the matrix, or reload it if the collection has changed."""
+        now = time.monotonic()
+        if self.matrix is not None and now - self._checked_at < _FRESHNESS_CHECK_INTERVAL:
+            return
+        self._checked_at = now
+
+        # Read before loading: a write racing the load only causes a reload
+        state = (self.collection.count(), self.generation())
+        if self.matrix is None or state != self._loaded_state:
+            self._load()
+            self._loaded_state = state
+
+    def _load(self) -> None:
+        """Load all embeddings and metadata, from a snapshot when current."""
+        fingerprint = None
+        if self.snapshot_path:
+            data = self.collection.get(include=["documents", "metadatas"])
+            fingerprint = _records_fingerprint(
+                data["ids"], data["documents"], data["metadatas"]
+            )
+
+        from_snapshot = fingerprint is not None and self._load_snapshot(fingerprint)
+        if not from_snapshot:
+            # Fingerprint exactly the records loaded, not the earlier read
+            fingerprint = self._load_collection()
+            if self.snapshot_path:
+                self._save_snapshot(fingerprint)
+
+        if HNSWLIB_AVAILABLE and len(self.ids) >= HNSW_MIN_ROWS:
+            graph_path = self._data_path(fingerprint, "hnsw") if self.snapshot_path else None
+            if from_snapshot and os.path.exists(graph_path):
+                self.graph = hnswlib.Index(space="ip", dim=self.matrix.shape[1])
+                self.graph.load_index(graph_path, max_elements=len(self.ids))
+            else:
+                self.graph = self._build_graph()
+                if graph_path:
+                    with suppress(OSError):
+                        self.graph.save_index(graph_path + ".tmp")
+                        os.replace(graph_path + ".tmp", graph_path)
+
+    def _data_path(self, fingerprint: str, extension: str) -> str:
+        """Path of a snapshot data file for the given fingerprint."""
+        return f"{self.snapshot_path}.{fingerprint[:16]}.{extension}"
+
+    def _load_snapshot(self, fingerprint: str) -> bool:
+        """Map the snapshot matrix if it was taken from the same records.
+
+        Args:
+            fingerprint: Fingerprint of the collection's current records
+
+        Returns:
+            True if the snapshot was loaded
+        """
+        try:
+            with open(f"{self.snapshot_path}.json", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta["dtype"] != self.dtype.name or meta["fingerprint"] != fingerprint:
+                return False
+            if meta["rows"]:
+                matrix = np.memmap(
+                    self._data_path(fingerprint, "bin"),
+                    dtype=self.dtype,
+                    mode="r",
+                    shape=(meta["rows"], meta["dim"])
+                )
+            else:
+                matrix = np.empty((0, 0), dtype=self.dtype)
+        except (OSError, ValueError, KeyError):
+            return False
+
+        self.ids = meta["ids"]
+        self.metadatas = meta["metadatas"]
+        self.matrix = matrix
+        return True
+
+    def _save_snapshot(self, fingerprint: str) -> None:
+        """Write the loaded matrix and metadata for later processes to map.
+
+        Args:
+            fingerprint: Fingerprint of the records the matrix was loaded from
+        """
+        meta_path = f"{self.snapshot_path}.json"
+        matrix_path = self._data_path(fingerprint, "bin")
+        meta = {
+            "dtype": self.dtype.name,
+            "fingerprint": fingerprint,
+            "rows": len(self.ids),
+            "dim": self.matrix.shape[1] if self.ids else 0,
+            "ids": self.ids,
+            "metadatas": self.metadatas,
+        }
+        try:
+            os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+            self.matrix.tofile(matrix_path + ".tmp")
+            os.replace(matrix_path + ".tmp", matrix_path)
+            with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(meta_path + ".tmp", meta_path)
+        except (OSError, TypeError, ValueError):
+            logger.debug("Could not write embedding snapshot %s", meta_path, exc_info=True)
+            return
+
+        # Data files of older snapshots; processes still mapping them keep
+        # their pages until they reload
+        current = (matrix_path, self._data_path(fingerprint, "hnsw"))
+        for pattern in ("*.bin", "*.hnsw"):
+            for path in glob.glob(f"{glob.escape(self.snapshot_path)}.{pattern}"):
+                if path not in current:
+                    with suppress(OSError):
+                        os.remove(path)
+
+    def _load_collection(self) -> str:
+        """Load all embeddings and metadata from the collection.
+
+        Returns:
+            Fingerprint of the loaded records
+        """
+        data = self.collection.get(include=["embeddings", "documents", "metadatas"])
+        self.ids = list(data["ids"])
+        self.metadatas = list(data["metadatas"]) if data["metadatas"] is not None else []
+        if self.ids and self.dtype == np.int8:
+            embeddings = np.asarray(data["embeddings"], dtype=np.float32)
+            self.matrix = np.rint(embeddings * _INT8_SCALE).astype(np.int8)
+        elif self.ids:
+            self.matrix = np.ascontiguousarray(data["embeddings"], dtype=self.dtype)
+        else:
+            self.matrix = np.empty((0, 0), dtype=self.dtype)
+
+        return _records_fingerprint(self.ids, data["documents"], data["metadatas"])
+
+    def _build_graph(self) -> Any:
+        """Build an HNSW graph over the loaded rows, labelled by row index."""
+        n, dim = self.matrix.shape
+        graph = hnswlib.Index(space="ip", dim=dim)
+        graph.init_index(max_elements=n, M=_HNSW_M, ef_construction=_HNSW_EF_CONSTRUCTION)
+        graph.add_items(self._as_float32(self.matrix), np.arange(n))
+        return graph
+
+    def _as_float32(self, rows: np.ndarray) -> np.ndarray:
+        """Upcast stored rows to float32, undoing int8 scaling."""
+        if rows.dtype == np.int8:
+            return rows.astype(np.float32) * (1.0 / _INT8_SCALE)
+        return rows.astype(np.float32, copy=False)
+
+    def _scores(self, query_embedding: np.ndarray) -> np.ndarray:
+        """Compute float32 inner products of every row with the query."""
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if self.matrix.dtype == np.float32:
+            return self.matrix @ query
+
+        # int8 rows are scaled once on the query instead of per element
+        if self.matrix.dtype == np.int8:
+            query = query * np.float32(1.0 / _INT8_SCALE)
+            if NUMBA_AVAILABLE:
+                return _int8_scores(self.matrix, query)
+
+        scores = np.empty(len(self.matrix), dtype=np.float32)
+        for start in range(0, len(self.matrix), _SCORE_BLOCK_ROWS):
+            block = self.matrix[start:start + _SCORE_BLOCK_ROWS]
+            scores[start:start + len(block)] = block.astype(np.float32) @ query
+        return scores
+
+    def search(self, query_embedding: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        """Return the top-k (row index, cosine similarity) pairs, best first.
+
+        Args:
+            query_embedding: L2-normalized query vector
+            k: Number of rows to return
+
+        Returns:
+            List of (row index, similarity) tuples sorted by similarity
+        """
+        self._ensure_current()
+
+        n = len(self.ids)
+        k = min(k, n)
+        if k <= 0:
+            return []
+
+        if self.graph is not None:
+            self.graph.set_ef(max(k * 2, _HNSW_MIN_EF))
+            labels, distances = self.graph.knn_query(
+                np.asarray(query_embedding, dtype=np.float32), k=k
+            )
+            # Inner-product distance is 1 - similarity, already sorted ascending
+            return [(int(i), 1.0 - float(d)) for i, d in zip(labels[0], distances[0])]
+
+        scores = self._scores(query_embedding)
+        if k < n:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(n)
+        top = top[np.argsort(-scores[top])]
+
+        return [(int(i), float(scores[i])) for i in top]
+
+
+def _l2_similarity(cosine: float) -> float:
+    """Map a cosine similarity onto ChromaDB's 1 - squared-L2 score scale.
+
+    For unit vectors ||a - b||^2 = 2 - 2cos, so scores and the 0.5 server
+    relevance threshold mean what they did when ChromaDB ran the queries.
+    """
+    return max(0.0, 2.0 * cosine - 1.0)
+
+
 class SemanticSearchResult(BaseModel):
     """Semantic search result."""
     query: str
@@ -44,6 +439,53 @@ class SemanticSearchResult(BaseModel):
     reasoning: str = Field(default="", description="Overall search reasoning")
 
 
+@functools.lru_cache(maxsize=1)
+def _get_shared_resources(
+    data_dir: str,
+    model_name: str
+) -> Tuple[Any, SentenceTransformer, Any, Any]:
+    """Load the ChromaDB client, embedding model and collections once.
+
+    Loading the sentence transformer takes seconds and hundreds of MB, so
+    every SemanticSearchTools instance for the same data directory and model
+    shares a single copy.
+
+    Args:
+        data_dir: Expanded data directory for ChromaDB storage
+        model_name: Sentence transformer model name
+
+    Returns:
+        Tuple of (chroma client, embedding model, servers collection, tools collection)
+    """
+    chroma_dir = os.path.join(data_dir, "chroma_db")
+
+    # Initialize ChromaDB client
+    chroma_client = chromadb.PersistentClient(
+        path=chroma_dir,
+        settings=Settings(
+            anonymized_telemetry=False,
+            allow_reset=True
+        )
+    )
+
+    # Initialize embedding model in inference mode
+    embedding_model = SentenceTransformer(model_name)
+    embedding_model.eval()
+
+    # Get or create collections
+    servers_collection = chroma_client.get_or_create_collection(
+        name="mcp_servers",
+        metadata={"description": "MCP server documentation summaries"}
+    )
+
+    tools_collection = chroma_client.get_or_create_collection(
+        name="mcp_tools",
+        metadata={"description": "MCP tool descriptions with server context"}
+    )
+
+    return chroma_client, embedding_model, servers_collection, tools_collection
+
+
 class SemanticSearchTools:
     """Tools for semantic search with RAG pipeline.
 
@@ -56,7 +498,8 @@ class SemanticSearchTools:
         self,
         base_url: str = "http://localhost:8080",
         data_dir: str = "~/.mcpproxy",
-        embedding_model: str = "all-MiniLM-L6-v2"
+        embedding_model: str = "all-MiniLM-L6-v2",
+        embedding_dtype: str = "float32"
     ):
         """Initialize semantic search tools.
 
@@ -64,48 +507,151 @@ class SemanticSearchTools:
             base_url: Base URL of the mcpproxy server
             data_dir: Data directory for ChromaDB storage
             embedding_model: Sentence transformer model name
+            embedding_dtype: In-memory embedding precision ("float32", "float16" or "int8")
         """
         self.base_url = base_url.rstrip('/')
-        self.client = httpx.Client(timeout=30.0)
+        self.client = get_http_client()
 
         # Expand data directory path
         data_dir = os.path.expanduser(data_dir)
-        chroma_dir = os.path.join(data_dir, "chroma_db")
-
-        # Initialize ChromaDB client
-        self.chroma_client = chromadb.PersistentClient(
-            path=chroma_dir,
-            settings=Settings(
-                anonymized_telemetry=False,
-                allow_reset=True
-            )
+
+        # Reuse the process-wide ChromaDB client, model and collections
+        (
+            self.chroma_client,
+            self.embedding_model,
+            self.servers_collection,
+            self.tools_collection,
+        ) = _get_shared_resources(data_dir, embedding_model)
+
+        # Exact-search matrices, loaded on first query from a memory-mapped
+        # snapshot when one is current, otherwise from ChromaDB
+        snapshot_dir = os.path.join(data_dir, "embedding_snapshots")
+        self._server_index = _EmbeddingMatrix(
+            self.chroma_client,
+            self.servers_collection,
+            snapshot_path=os.path.join(snapshot_dir, "mcp_servers")
+        )
+        self._tool_index = _EmbeddingMatrix(
+            self.chroma_client,
+            self.tools_collection,
+            dtype=embedding_dtype,
+            snapshot_path=os.path.join(snapshot_dir, "mcp_tools")
         )
 
-        # Initialize embedding model
-        self.embedding_model = SentenceTransformer(embedding_model)
+        # Repeated queries skip the model; LRU keyed by the exact query text,
+        # since cased embedding models distinguish "GitHub" from "github"
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._query_cache_hits = 0
+        self._query_cache_misses = 0
 
-        # Get or create collections
-        self.servers_collection = self.chroma_client.get_or_create_collection(
-            name="mcp_servers",
-            metadata={"description": "MCP server documentation summaries"}
-        )
+    def servers_version(self) -> str:
+        """Version of the indexed server summaries.
 
-        self.tools_collection = self.chroma_client.get_or_create_collection(
-            name="mcp_tools",
-            metadata={"description": "MCP tool descriptions with server context"}
-        )
+        Combines the collection's write generation with its row count, so it
+        changes after writes from any process sharing the data directory.
+
+        Returns:
+            Opaque version string
+        """
+        return f"{self._server_index.generation()}-{self.servers_collection.count()}"
 
-    def _generate_embedding(self, text: str) -> List[float]:
-        """Generate embedding for text.
+    def _encode(self, text: str) -> np.ndarray:
+        """Encode text into an L2-normalized embedding.
 
         Args:
             text: Text to embed
 
         Returns:
-            Embedding vector
+            Embedding vector as a float32 array
+        """
+        with torch.inference_mode():
+            return self.embedding_model.encode(
+                text,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+
+    def _cache_query_embedding(self, query: str, embedding: np.ndarray) -> None:
+        """Store a read-only query embedding, evicting the least recent."""
+        embedding.setflags(write=False)
+        self._query_cache[query] = embedding
+        if len(self._query_cache) > QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+
+    def _encode_query(self, query: str) -> np.ndarray:
+        """Encode a search query, reusing embeddings of recent queries.
+
+        Args:
+            query: Search query
+
+        Returns:
+            Read-only L2-normalized query embedding
+        """
+        embedding = self._query_cache.get(query)
+        if embedding is not None:
+            self._query_cache.move_to_end(query)
+            self._query_cache_hits += 1
+            return embedding
+
+        self._query_cache_misses += 1
+        embedding = self._encode(query)
+        self._cache_query_embedding(query, embedding)
+        return embedding
+
+    def prime_query_cache(self, queries: List[str]) -> None:
+        """Encode uncached queries in one model call ahead of searching them.
+
+        Args:
+            queries: Search queries about to be issued
+        """
+        uncached = [
+            query for query in dict.fromkeys(queries)
+            if query not in self._query_cache
+        ]
+        if not uncached:
+            return
+
+        self._query_cache_misses += len(uncached)
+        for query, embedding in zip(uncached, self._encode_batch(uncached)):
+            self._cache_query_embedding(query, embedding)
+
+    def query_cache_info(self) -> Dict[str, int]:
+        """Get hit/miss statistics for the query embedding cache.
+
+        Returns:
+            Dictionary with hits, misses, size and maxsize
+        """
+        return {
+            "hits": self._query_cache_hits,
+            "misses": self._query_cache_misses,
+            "size": len(self._query_cache),
+            "maxsize": QUERY_CACHE_SIZE,
+        }
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        """Encode many texts in one model call, encoding duplicates once.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Matrix of L2-normalized embeddings, one row per input text
         """
-        embedding = self.embedding_model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+        unique_texts = list(dict.fromkeys(texts))
+        with torch.inference_mode():
+            unique_embeddings = self.embedding_model.encode(
+                unique_texts,
+                batch_size=_ENCODE_BATCH_SIZE,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+
+        if len(unique_texts) == len(texts):
+            return unique_embeddings
+
+        position = {text: i for i, text in enumerate(unique_texts)}
+        return unique_embeddings[[position[text] for text in texts]]
 
     def index_server_summary(self, server_summary: ServerSummary) -> None:
         """Index MCP server documentation summary.
@@ -113,30 +659,114 @@ class SemanticSearchTools:
         Args:
             server_summary: Server summary to index
         """
+        self.index_server_summaries([server_summary])
+
+    def index_server_summaries(self, server_summaries: List[ServerSummary]) -> int:
+        """Index many server summaries with one embedding pass.
+
+        Later summaries replace earlier ones for the same server name.
+
+        Args:
+            server_summaries: Server summaries to index
+
+        Returns:
+            Number of servers indexed
+        """
+        summaries = list({s.server_name: s for s in server_summaries}.values())
+        if not summaries:
+            return 0
+
         # Create searchable text combining all information
-        searchable_text = f"""
-        Server: {server_summary.server_name}
-        Summary: {server_summary.summary}
-        Capabilities: {', '.join(server_summary.capabilities)}
-        Use Cases: {', '.join(server_summary.typical_use_cases)}
-        """.strip()
-
-        # Generate embedding
-        embedding = self._generate_embedding(searchable_text)
-
-        # Store in ChromaDB
-        self.servers_collection.upsert(
-            ids=[server_summary.server_name],
-            documents=[searchable_text],
-            embeddings=[embedding],
-            metadatas=[{
-                "server_name": server_summary.server_name,
-                "summary": server_summary.summary,
-                "capabilities": ",".join(server_summary.capabilities),
-                "use_cases": ",".join(server_summary.typical_use_cases)
-            }]
+        texts = [
+            "\n".join((
+                f"Server: {summary.server_name}",
+                f"Summary: {summary.summary}",
+                f"Capabilities: {', '.join(summary.capabilities)}",
+                f"Use Cases: {', '.join(summary.typical_use_cases)}",
+            ))
+            for summary in summaries
+        ]
+        metadatas = [
+            {
+                "server_name": summary.server_name,
+                "summary": summary.summary,
+                "capabilities": ",".join(summary.capabilities),
+                "use_cases": ",".join(summary.typical_use_cases)
+            }
+            for summary in summaries
+        ]
+        self._upsert_records(
+            self.servers_collection,
+            self._server_index,
+            [summary.server_name for summary in summaries],
+            texts,
+            metadatas
         )
 
+        return len(summaries)
+
+    def _upsert_records(
+        self,
+        collection: Any,
+        index: _EmbeddingMatrix,
+        ids: List[str],
+        texts: List[str],
+        metadatas: List[Dict[str, Any]]
+    ) -> int:
+        """Embed and upsert the records whose stored copy is missing or stale.
+
+        ChromaDB already holds each record's document and embedding, so
+        records whose document and metadata are unchanged keep their stored
+        embedding and re-indexing an unchanged store never runs the model.
+
+        Args:
+            collection: ChromaDB collection to write
+            index: In-memory matrix to invalidate after writes
+            ids: Record IDs (unique)
+            texts: Searchable document per record
+            metadatas: Metadata per record
+
+        Returns:
+            Number of records written
+        """
+        stored: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        try:
+            for start in range(0, len(ids), _UPSERT_BATCH_SIZE):
+                existing = collection.get(
+                    ids=ids[start:start + _UPSERT_BATCH_SIZE],
+                    include=["documents", "metadatas"]
+                )
+                stored.update(zip(
+                    existing["ids"],
+                    zip(existing["documents"], existing["metadatas"])
+                ))
+        except Exception:
+            logger.debug("Could not read stored records, re-embedding all", exc_info=True)
+
+        changed = [
+            i for i, record_id in enumerate(ids)
+            if stored.get(record_id) != (texts[i], metadatas[i])
+        ]
+        if not changed:
+            return 0
+
+        ids = [ids[i] for i in changed]
+        texts = [texts[i] for i in changed]
+        metadatas = [metadatas[i] for i in changed]
+        embeddings = self._encode_batch(texts)
+
+        for start in range(0, len(ids), _UPSERT_BATCH_SIZE):
+            end = start + _UPSERT_BATCH_SIZE
+            collection.upsert(
+                ids=ids[start:end],
+                documents=texts[start:end],
+                embeddings=embeddings[start:end].tolist(),
+                metadatas=metadatas[start:end]
+            )
+        index.invalidate()
+
+        return len(ids)
+
     def index_tool(
         self,
         tool_name: str,
@@ -154,68 +784,87 @@ class SemanticSearchTools:
             input_schema: Tool parameters schema
             server_context: Optional server documentation context
         """
-        # Create searchable text with server context
-        searchable_text = f"""
-        Tool: {tool_name}
-        Server: {server_name}
-        Description: {description}
+        searchable_text, metadata = self._tool_document(
+            tool_name, server_name, description, input_schema, server_context
+        )
+
+        self._upsert_records(
+            self.tools_collection,
+            self._tool_index,
+            [tool_name],
+            [searchable_text],
+            [metadata]
+        )
+
+    @staticmethod
+    def _tool_document(
+        tool_name: str,
+        server_name: str,
+        description: str,
+        input_schema: Dict[str, Any],
+        server_context: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build the searchable text and metadata stored for a tool.
+
+        Args:
+            tool_name: Full tool name (server:tool)
+            server_name: Server name
+            description: Tool description
+            input_schema: Tool parameters schema
+            server_context: Optional server documentation context
+
+        Returns:
+            Tuple of (searchable text, metadata)
         """
+        # Create searchable text with server context
+        parts = [
+            f"Tool: {tool_name}",
+            f"Server: {server_name}",
+            f"Description: {description}",
+        ]
 
         if server_context:
-            searchable_text += f"\nServer Context: {server_context}"
+            parts.append(f"Server Context: {server_context}")
 
         # Add parameter information
-        if input_schema and "properties" in input_schema:
-            params = ", ".join(input_schema["properties"].keys())
-            searchable_text += f"\nParameters: {params}"
-
-        searchable_text = searchable_text.strip()
-
-        # Generate embedding
-        embedding = self._generate_embedding(searchable_text)
-
-        # Store in ChromaDB
-        self.tools_collection.upsert(
-            ids=[tool_name],
-            documents=[searchable_text],
-            embeddings=[embedding],
-            metadatas=[{
-                "tool_name": tool_name,
-                "server_name": server_name,
-                "description": description,
-                "has_server_context": bool(server_context)
-            }]
-        )
+        properties = input_schema.get("properties") if input_schema else None
+        if properties:
+            parts.append("Parameters: " + ", ".join(properties))
+
+        searchable_text = "\n".join(parts)
 
-    def _get_server_context(self, query: str, top_k: int = 3) -> Dict[str, float]:
+        metadata = {
+            "tool_name": tool_name,
+            "server_name": server_name,
+            "description": description,
+            "has_server_context": bool(server_context)
+        }
+
+        return searchable_text, metadata
+
+    def _get_server_context(
+        self,
+        query: str,
+        top_k: int = 3,
+        query_embedding: Optional[np.ndarray] = None
+    ) -> Dict[str, float]:
         """Retrieve relevant server contexts for query.
 
         Args:
             query: Search query
             top_k: Number of servers to retrieve
+            query_embedding: Precomputed query embedding (optional)
 
         Returns:
             Dictionary mapping server names to relevance scores
         """
-        # Generate query embedding
-        query_embedding = self._generate_embedding(query)
-
-        # Search server summaries
-        results = self.servers_collection.query(
-            query_embeddings=[query_embedding],
-            n_results=top_k
-        )
-
-        if not results or not results['ids']:
-            return {}
+        if query_embedding is None:
+            query_embedding = self._encode_query(query)
 
-        # Extract server relevance scores
+        # Search server summaries (1 = perfect match, 0 = no match)
         server_scores = {}
-        for i, server_id in enumerate(results['ids'][0]):
-            distance = results['distances'][0][i] if results['distances'] else 0
-            # Convert distance to similarity score (1 = perfect match, 0 = no match)
-            similarity = max(0, 1 - distance)
-            server_scores[server_id] = similarity
+        for row, score in self._server_index.search(query_embedding, top_k):
+            server_scores[self._server_index.ids[row]] = _l2_similarity(score)
 
         return server_scores
 
@@ -235,18 +884,18 @@ class SemanticSearchTools:
         Returns:
             Semantic search result with ranked tools
         """
+        query_embedding = self._encode_query(query)
+
         # Step 1: Retrieve relevant server contexts
-        server_scores = self._get_server_context(query, top_k=5)
+        server_scores = self._get_server_context(query, top_k=5, query_embedding=query_embedding)
 
         # Step 2: Retrieve tool candidates using embeddings
-        query_embedding = self._generate_embedding(query)
-
-        tool_results = self.tools_collection.query(
-            query_embeddings=[query_embedding],
-            n_results=min(limit * 3, 50)  # Retrieve more candidates for reranking
+        tool_hits = self._tool_index.search(
+            query_embedding,
+            min(limit * 3, 50)  # Retrieve more candidates for reranking
         )
 
-        if not tool_results or not tool_results['ids']:
+        if not tool_hits:
             return SemanticSearchResult(
                 query=query,
                 tools=[],
@@ -257,13 +906,13 @@ class SemanticSearchTools:
         # Step 3: Rerank tools using server context
         candidates = []
 
-        for i, tool_id in enumerate(tool_results['ids'][0]):
-            metadata = tool_results['metadatas'][0][i]
+        for row, score in tool_hits:
+            tool_id = self._tool_index.ids[row]
+            metadata = self._tool_index.metadatas[row]
             server_name = metadata['server_name']
 
             # Calculate similarity score
-            distance = tool_results['distances'][0][i] if tool_results['distances'] else 0
-            similarity_score = max(0, 1 - distance)
+            similarity_score = _l2_similarity(score)
 
             # Calculate context score (boost tools from relevant servers)
             context_score = server_scores.get(server_name, 0.0)
@@ -278,22 +927,19 @@ class SemanticSearchTools:
                 if context_score > 0.5:
                     reasoning += f" (High relevance from {server_name})"
 
-            candidate = ToolCandidate(
+            candidates.append(_CandidateRaw(
                 tool_name=tool_id,
                 server_name=server_name,
                 description=metadata['description'],
-                input_schema={},  # Will be filled from mcpproxy
                 similarity_score=similarity_score,
                 context_score=context_score,
                 final_score=final_score,
                 reasoning=reasoning
-            )
-
-            candidates.append(candidate)
+            ))
 
         # Step 4: Sort by final score and limit results
         candidates.sort(key=lambda x: x.final_score, reverse=True)
-        top_candidates = candidates[:limit]
+        top_candidates = [c.to_public() for c in candidates[:limit]]
 
         # Generate overall reasoning
         overall_reasoning = f"Found {len(candidates)} candidates, selected top {len(top_candidates)} based on semantic similarity and server context"
@@ -331,7 +977,7 @@ class SemanticSearchTools:
 
         # Get keyword results from mcpproxy BM25
         try:
-            response = self.client.get(
+            response = await self.client.get(
                 f"{self.base_url}/api/tools/search",
                 params={"query": query, "limit": limit}
             )
@@ -339,58 +985,82 @@ class SemanticSearchTools:
             keyword_data = response.json()
             keyword_tools = keyword_data.get("tools", [])
         except Exception as e:
-            print(f"Keyword search failed: {e}")
+            logger.warning("Keyword search failed: %s", e)
             keyword_tools = []
 
-        # Combine and rerank results
-        tool_scores = {}
-
-        # Add semantic scores
-        for i, tool in enumerate(semantic_results.tools):
-            rank_score = 1.0 - (i / len(semantic_results.tools))
-            tool_scores[tool.tool_name] = {
-                "semantic": tool.final_score * rank_score * semantic_weight,
-                "keyword": 0.0,
-                "tool": tool
-            }
-
-        # Add keyword scores
-        keyword_weight = 1.0 - semantic_weight
+        # Align semantic and keyword scores over the distinct tool names:
+        # semantic hits take the first rows, keyword-only tools follow
+        semantic_hits = semantic_results.tools
+        rows: Dict[str, int] = {tool.tool_name: i for i, tool in enumerate(semantic_hits)}
+        keyword_only: List[Dict[str, Any]] = []
+        keyword_rows = np.empty(len(keyword_tools), dtype=np.intp)
         for i, tool in enumerate(keyword_tools):
             tool_name = tool.get("name", "")
-            rank_score = 1.0 - (i / len(keyword_tools))
+            row = rows.get(tool_name)
+            if row is None:
+                row = rows[tool_name] = len(semantic_hits) + len(keyword_only)
+                keyword_only.append(tool)
+            keyword_rows[i] = row
+
+        # Rank-weighted scores (the top hit scores 1, falling linearly), in
+        # float64 so ties and rounding match plain Python floats
+        semantic_scores = np.zeros(len(rows), dtype=np.float64)
+        if semantic_hits:
+            n = len(semantic_hits)
+            semantic_scores[:n] = (
+                np.fromiter((tool.final_score for tool in semantic_hits), np.float64, n)
+                * (1.0 - np.arange(n, dtype=np.float64) / n)
+                * semantic_weight
+            )
+
+        keyword_scores = np.zeros(len(rows), dtype=np.float64)
+        if keyword_tools:
+            n = len(keyword_tools)
+            keyword_scores[keyword_rows] = (
+                (1.0 - np.arange(n, dtype=np.float64) / n) * (1.0 - semantic_weight)
+            )
+
+        final_scores = semantic_scores + keyword_scores
 
-            if tool_name in tool_scores:
-                tool_scores[tool_name]["keyword"] = rank_score * keyword_weight
+        # Top-k rows, best first; ties keep semantic-then-keyword order
+        k = min(limit, len(rows))
+        if k < len(rows):
+            top = np.sort(np.argpartition(-final_scores, k - 1)[:k])
+        else:
+            top = np.arange(len(rows))
+        top = top[np.argsort(-final_scores[top], kind="stable")]
+
+        # Build candidates only for the selected rows
+        final_results = []
+        for row in top.tolist():
+            if row < len(semantic_hits):
+                tool = semantic_hits[row]
+                candidate = _CandidateRaw(
+                    tool_name=tool.tool_name,
+                    server_name=tool.server_name,
+                    description=tool.description,
+                    similarity_score=tool.similarity_score,
+                    context_score=tool.context_score,
+                    final_score=tool.final_score,
+                    input_schema=tool.input_schema
+                )
             else:
-                # Create candidate from keyword result
-                candidate = ToolCandidate(
-                    tool_name=tool_name,
+                tool = keyword_only[row - len(semantic_hits)]
+                candidate = _CandidateRaw(
+                    tool_name=tool.get("name", ""),
                     server_name=tool.get("server", ""),
                     description=tool.get("description", ""),
-                    input_schema=tool.get("inputSchema", {}),
                     similarity_score=0.0,
                     context_score=0.0,
-                    final_score=rank_score * keyword_weight,
-                    reasoning=f"From keyword search (rank {i+1})"
+                    final_score=0.0,
+                    input_schema=tool.get("inputSchema", {})
                 )
-                tool_scores[tool_name] = {
-                    "semantic": 0.0,
-                    "keyword": rank_score * keyword_weight,
-                    "tool": candidate
-                }
 
-        # Calculate final scores and sort
-        final_results = []
-        for tool_name, scores in tool_scores.items():
-            combined_score = scores["semantic"] + scores["keyword"]
-            tool = scores["tool"]
-            tool.final_score = combined_score
-            tool.reasoning = f"Hybrid: semantic={scores['semantic']:.2f}, keyword={scores['keyword']:.2f}"
-            final_results.append(tool)
-
-        final_results.sort(key=lambda x: x.final_score, reverse=True)
-        final_results = final_results[:limit]
+            semantic_score = float(semantic_scores[row])
+            keyword_score = float(keyword_scores[row])
+            candidate.final_score = float(final_scores[row])
+            candidate.reasoning = f"Hybrid: semantic={semantic_score:.2f}, keyword={keyword_score:.2f}"
+            final_results.append(candidate.to_public())
 
         return SemanticSearchResult(
             query=query,
@@ -399,65 +1069,91 @@ class SemanticSearchTools:
             reasoning=f"Hybrid search: {len(semantic_results.tools)} semantic + {len(keyword_tools)} keyword results"
         )
 
-    def sync_from_mcpproxy(self) -> int:
-        """Sync tool index from mcpproxy.
-
-        Fetches all tools from mcpproxy and indexes them with embeddings.
-
-        Returns:
-            Number of tools indexed
-        """
-        try:
-            # Fetch all tools from mcpproxy
-            response = self.client.get(f"{self.base_url}/api/tools/list")
-            response.raise_for_status()
+    def _iter_tool_batches(
+        self,
+        tools: List[Dict[str, Any]]
+    ) -> Iterator[Dict[str, Tuple[str, Dict[str, Any]]]]:
+        """Build tool documents in batches of _SYNC_BATCH_SIZE listings.
 
-            data = response.json()
-            tools = data.get("tools", [])
+        Server contexts are fetched once per distinct server, the first time
+        a batch needs them.
 
-            indexed_count = 0
+        Args:
+            tools: Tool listings from the mcpproxy API
 
-            for tool in tools:
-                tool_name = tool.get("name", "")
-                server_name = tool.get("server", "")
-                description = tool.get("description", "")
-                input_schema = tool.get("inputSchema", {})
+        Yields:
+            Mapping of tool name to (searchable text, metadata) per batch
+        """
+        context_by_server: Dict[str, Optional[str]] = {}
 
-                if not tool_name or not server_name:
-                    continue
+        for start in range(0, len(tools), _SYNC_BATCH_SIZE):
+            batch = [
+                tool for tool in tools[start:start + _SYNC_BATCH_SIZE]
+                if tool.get("name") and tool.get("server")
+            ]
 
-                # Get server context if available
-                server_context = None
+            missing = {tool["server"] for tool in batch} - context_by_server.keys()
+            if missing:
+                context_by_server.update(dict.fromkeys(missing))
                 try:
                     server_results = self.servers_collection.get(
-                        ids=[server_name],
+                        ids=list(missing),
                         include=["documents"]
                     )
                     if server_results and server_results['documents']:
-                        server_context = server_results['documents'][0]
+                        context_by_server.update(
+                            zip(server_results['ids'], server_results['documents'])
+                        )
                 except Exception:
                     pass
 
-                # Index the tool
-                self.index_tool(
-                    tool_name=tool_name,
-                    server_name=server_name,
-                    description=description,
-                    input_schema=input_schema,
-                    server_context=server_context
+            documents: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+            for tool in batch:
+                server_name = tool["server"]
+                documents[tool["name"]] = self._tool_document(
+                    tool["name"],
+                    server_name,
+                    tool.get("description", ""),
+                    tool.get("inputSchema", {}),
+                    context_by_server.get(server_name)
                 )
 
-                indexed_count += 1
+            if documents:
+                yield documents
 
-            return indexed_count
+    async def sync_from_mcpproxy(self) -> int:
+        """Sync tool index from mcpproxy.
 
-        except Exception as e:
-            print(f"Failed to sync from mcpproxy: {e}")
-            return 0
+        Fetches all tools from mcpproxy and indexes them with embeddings,
+        encoding and writing them in fixed-size batches so peak memory does
+        not grow with the number of tools.
 
-    def __del__(self):
-        """Cleanup HTTP client."""
+        Returns:
+            Number of tools indexed
+        """
         try:
-            self.client.close()
+            # Fetch all tools from mcpproxy
+            response = await self.client.get(f"{self.base_url}/api/tools/list")
+            response.raise_for_status()
+
+            data = response.json()
+            tools = data.get("tools", [])
+
+            # Embed and write one bounded batch at a time; re-listed names
+            # overwrite earlier ones (last listing wins, as with upsert)
+            tool_names = set()
+            for documents in self._iter_tool_batches(tools):
+                self._upsert_records(
+                    self.tools_collection,
+                    self._tool_index,
+                    list(documents),
+                    [text for text, _ in documents.values()],
+                    [metadata for _, metadata in documents.values()]
+                )
+                tool_names.update(documents)
+
+            return len(tool_names)
+
         except Exception:
-            pass
+            logger.exception("Failed to sync from mcpproxy")
+            return 0
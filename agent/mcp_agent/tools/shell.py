@@ -5,7 +5,7 @@ Provides tools to run system commands and programs.
 
 import asyncio
 import shlex
-from typing import Optional
+from typing import List, Optional, Union
 from pydantic import BaseModel, Field
 
 class CommandResult(BaseModel):
@@ -25,28 +25,49 @@ class ShellTools:
 
     async def execute_command(
         self,
-        command: str,
+        command: Union[str, List[str]],
         timeout: int = 300,
-        working_dir: Optional[str] = None
+        working_dir: Optional[str] = None,
+        use_shell: bool = False
     ) -> CommandResult:
-        """Execute a shell command.
-        
+        """Execute a command.
+
+        Command strings run through the shell, so builtins, pipes,
+        redirection and comments behave as typed. Argument lists are
+        executed directly without an intermediate /bin/sh unless
+        use_shell=True.
+
         Args:
-            command: The command line string to execute
+            command: The command line string or argument list to execute
             timeout: Execution timeout in seconds (default: 300)
             working_dir: Working directory for execution (optional)
-            
+            use_shell: Run an argument list through the shell as well
+
         Returns:
             CommandResult with output and status
         """
+        argv = None
+        if not isinstance(command, str):
+            if not use_shell:
+                argv = list(command)
+            command = shlex.join(command)
+
         try:
             # Create subprocess
-            process = await asyncio.create_subprocess_shell(
-                command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=working_dir
-            )
+            if argv is not None:
+                process = await asyncio.create_subprocess_exec(
+                    *argv,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    cwd=working_dir
+                )
+            else:
+                process = await asyncio.create_subprocess_shell(
+                    command,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    cwd=working_dir
+                )
             
             # Wait for execution with timeout
             try:
@@ -1,9 +1,30 @@
 """Startup and service management tools."""
 
 import httpx
-from typing import Literal, Optional, Dict, Any, List
+from typing import Literal, Optional, Dict, Any, List, Callable, Tuple
 from pydantic import BaseModel
 
+from .http_client import get_http_client
+
+
+# Startup update validators: field -> (type, type error, value check, check error)
+_VALIDATORS: Dict[str, Tuple[type, str, Optional[Callable[[Any], bool]], Optional[str]]] = {
+    "command": (
+        str, "command must be a string",
+        lambda v: bool(v.strip()), "command cannot be empty",
+    ),
+    "args": (
+        list, "args must be a list",
+        lambda v: all(isinstance(arg, str) for arg in v), "all args must be strings",
+    ),
+    "env": (
+        dict, "env must be a dictionary",
+        lambda v: all(isinstance(k, str) and isinstance(val, str) for k, val in v.items()),
+        "env keys and values must be strings",
+    ),
+    "working_dir": (str, "working_dir must be a string", None, None),
+}
+
 
 class StartupConfig(BaseModel):
     """Startup configuration for server."""
@@ -35,14 +56,19 @@ class ServiceStatus(BaseModel):
 class StartupTools:
     """Tools for managing startup scripts and services."""
 
-    def __init__(self, base_url: str = "http://localhost:8080"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8080",
+        client: Optional[httpx.AsyncClient] = None
+    ):
         """Initialize startup tools.
 
         Args:
             base_url: Base URL for mcpproxy agent API
+            client: HTTP client to use (defaults to the shared pooled client)
         """
         self.base_url = base_url
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.client = client or get_http_client()
 
     async def read_startup_script(self, server_name: str) -> StartupScriptResult:
         """Read server startup configuration.
@@ -138,31 +164,14 @@ class StartupTools:
         """
         errors = []
 
-        # Validate command
-        if "command" in updates:
-            if not isinstance(updates["command"], str):
-                errors.append("command must be a string")
-            elif not updates["command"].strip():
-                errors.append("command cannot be empty")
-
-        # Validate args
-        if "args" in updates:
-            if not isinstance(updates["args"], list):
-                errors.append("args must be a list")
-            elif not all(isinstance(arg, str) for arg in updates["args"]):
-                errors.append("all args must be strings")
-
-        # Validate env
-        if "env" in updates:
-            if not isinstance(updates["env"], dict):
-                errors.append("env must be a dictionary")
-            elif not all(isinstance(k, str) and isinstance(v, str) for k, v in updates["env"].items()):
-                errors.append("env keys and values must be strings")
-
-        # Validate working_dir
-        if "working_dir" in updates:
-            if not isinstance(updates["working_dir"], str):
-                errors.append("working_dir must be a string")
+        for key, (expected_type, type_error, check, check_error) in _VALIDATORS.items():
+            if key not in updates:
+                continue
+            value = updates[key]
+            if not isinstance(value, expected_type):
+                errors.append(type_error)
+            elif check is not None and not check(value):
+                errors.append(check_error)
 
         return errors
 
@@ -184,18 +193,18 @@ class StartupTools:
         # Current implementation returns status information
 
         try:
-            # Get server configuration
-            response = await self.client.get(
-                f"{self.base_url}/api/v1/agent/servers/{server_name}/config"
-            )
-            response.raise_for_status()
-            config = response.json()
+            if action == "status":
+                # Only the status action needs the server configuration
+                response = await self.client.get(
+                    f"{self.base_url}/api/v1/agent/servers/{server_name}/config"
+                )
+                response.raise_for_status()
+                config = response.json()
 
-            # Check if Docker isolation is enabled
-            # (This would need to be exposed in the API)
-            docker_enabled = False  # Placeholder
+                # Check if Docker isolation is enabled
+                # (This would need to be exposed in the API)
+                docker_enabled = False  # Placeholder
 
-            if action == "status":
                 return {
                     "success": True,
                     "service_name": server_name,
@@ -308,5 +317,8 @@ class StartupTools:
         }
 
     async def close(self):
-        """Close HTTP client."""
-        await self.client.aclose()
+        """Release the HTTP client.
+
+        The client is shared or injected and closed by its owner, so there
+        is nothing to release here.
+        """
@@ -3,12 +3,61 @@
 Provides tools to search the web using DuckDuckGo.
 """
 
-from typing import List, Optional
-from pydantic import BaseModel, Field
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+from pydantic import BaseModel, ConfigDict, Field
 from duckduckgo_search import DDGS
 
+logger = logging.getLogger(__name__)
+
+# Seconds a cached search stays fresh, and how many searches are kept
+SEARCH_CACHE_TTL = 300.0
+SEARCH_CACHE_SIZE = 512
+
+_search_cache: "OrderedDict[Tuple[str, int], Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+
+# One DDGS session per worker thread: batched queries run concurrently in
+# the to_thread pool, and DDGS is not documented as safe to share across
+# threads. Pool threads are reused, so each keeps its connection alive.
+_ddgs_local = threading.local()
+
+
+def _ddgs_text(query: str, max_results: int) -> List[Dict[str, Any]]:
+    """Run a blocking DuckDuckGo text search on this thread's session."""
+    ddgs = getattr(_ddgs_local, "session", None)
+    if ddgs is None:
+        ddgs = _ddgs_local.session = DDGS()
+    return list(ddgs.text(query, max_results=max_results))
+
+
+def _cache_get(key: Tuple[str, int]) -> Optional[List[Dict[str, Any]]]:
+    """Return fresh cached results for key, evicting them if expired."""
+    entry = _search_cache.get(key)
+    if entry is None:
+        return None
+    if time.monotonic() - entry[0] >= SEARCH_CACHE_TTL:
+        del _search_cache[key]
+        return None
+    _search_cache.move_to_end(key)
+    return entry[1]
+
+
+def _cache_put(key: Tuple[str, int], results: List[Dict[str, Any]]) -> None:
+    """Store results for key, dropping the least recently used entry when full."""
+    _search_cache[key] = (time.monotonic(), results)
+    _search_cache.move_to_end(key)
+    while len(_search_cache) > SEARCH_CACHE_SIZE:
+        _search_cache.popitem(last=False)
+
+
 class SearchResult(BaseModel):
     """Result from a web search."""
+    model_config = ConfigDict(frozen=True)
+
     title: str = Field(description="Title of the search result")
     href: str = Field(description="URL of the result")
     body: str = Field(description="Snippet or summary of the content")
@@ -22,32 +71,48 @@ class WebSearchTools:
 
     async def search_web(
         self,
-        query: str,
+        query: Union[str, List[str]],
         max_results: int = 5
     ) -> List[SearchResult]:
         """Search the web for information.
-        
+
+        The blocking DuckDuckGo requests run in worker threads over a shared
+        session, and results are cached for SEARCH_CACHE_TTL seconds.
+
         Args:
-            query: The search query string
-            max_results: Maximum number of results to return (default: 5)
+            query: The search query string, or a list of queries to run
+                concurrently
+            max_results: Maximum number of results per query (default: 5)
             
         Returns:
-            List of search results
+            List of search results, in query order when several queries
+            are given
         """
-        results = []
+        queries = [query] if isinstance(query, str) else query
+
+        batches = await asyncio.gather(
+            *(self._search_one(q, max_results) for q in queries)
+        )
+
+        return [
+            SearchResult.model_construct(
+                title=r.get("title", ""),
+                href=r.get("href", ""),
+                body=r.get("body", "")
+            )
+            for batch in batches
+            for r in batch
+        ]
+
+    async def _search_one(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """Fetch raw results for one query, from cache when fresh."""
         try:
-            with DDGS() as ddgs:
-                # Use text search
-                search_results = list(ddgs.text(query, max_results=max_results))
-                
-                for r in search_results:
-                    results.append(SearchResult(
-                        title=r.get("title", ""),
-                        href=r.get("href", ""),
-                        body=r.get("body", "")
-                    ))
-                    
-            return results
-        except Exception as e:
-            print(f"Web search failed: {e}")
+            key = (query, max_results)
+            search_results = _cache_get(key)
+            if search_results is None:
+                search_results = await asyncio.to_thread(_ddgs_text, query, max_results)
+                _cache_put(key, search_results)
+            return search_results
+        except Exception:
+            logger.exception("Web search failed for %r", query)
             return []
@@ -6,24 +6,63 @@ called from the Go mcpproxy server.
 """
 
 import asyncio
+import importlib.util
+import logging
 import os
 import sys
-from typing import Optional
-from contextlib import asynccontextmanager
+from typing import Optional, Tuple
+from contextlib import asynccontextmanager, suppress
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 import uvicorn
 
+from mcp_agent.tools.http_client import get_http_client
 from mcp_agent.tools.semantic_search import SemanticSearchTools, ServerSummary
 from mcp_agent.graph.semantic_agent import SemanticSearchAgent, SearchRequest, SearchResponse
 
 
+logger = logging.getLogger("mcpproxy.semantic")
+
+# uvloop and httptools come with uvicorn[standard]; where they are missing
+# (e.g. Windows) the server falls back to asyncio and h11
+UVLOOP_AVAILABLE = importlib.util.find_spec("uvloop") is not None
+HTTPTOOLS_AVAILABLE = importlib.util.find_spec("httptools") is not None
+
 # Global instances
 semantic_tools: Optional[SemanticSearchTools] = None
 semantic_agent: Optional[SemanticSearchAgent] = None
 
+# /health is polled by liveness probes, so collection counts are refreshed
+# in the background at this interval (seconds) instead of per request
+HEALTH_REFRESH_INTERVAL = 5.0
+
+# Page size bounds for /api/servers, and how many rendered pages are kept
+# per generation
+SERVERS_PAGE_DEFAULT = 100
+SERVERS_PAGE_MAX = 1000
+SERVERS_CACHE_PAGES = 64
+
+
+async def _read_counts() -> Tuple[int, int]:
+    """Count indexed tools and servers without blocking the event loop."""
+    return await asyncio.gather(
+        asyncio.to_thread(semantic_tools.tools_collection.count),
+        asyncio.to_thread(semantic_tools.servers_collection.count)
+    )
+
+
+async def _refresh_counts(app: FastAPI):
+    """Periodically refresh the collection counts served by /health."""
+    while True:
+        await asyncio.sleep(HEALTH_REFRESH_INTERVAL)
+        try:
+            app.state.counts = await _read_counts()
+        except Exception:
+            logger.warning("Failed to refresh collection counts", exc_info=True)
+            app.state.counts = None
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -31,52 +70,71 @@ async def lifespan(app: FastAPI):
     global semantic_tools, semantic_agent
 
     # Initialize on startup
-    print("🚀 Initializing semantic search service...")
+    logger.info("🚀 Initializing semantic search service...")
 
     base_url = os.getenv("MCPPROXY_URL", "http://localhost:8080")
     data_dir = os.getenv("MCPPROXY_DATA_DIR", "~/.mcpproxy")
     embedding_model = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+    embedding_dtype = os.getenv("EMBEDDING_DTYPE", "float32")
+
+    # Pooled HTTP client shared by all tools for the lifetime of the app
+    app.state.http_client = get_http_client()
+
+    # /api/servers response cache, keyed by the servers collection version
+    app.state.servers_cache = {}
+
+    # (tools, servers) counts for /health, kept fresh by _refresh_counts
+    app.state.counts = None
 
     try:
         # Initialize semantic search tools
         semantic_tools = SemanticSearchTools(
             base_url=base_url,
             data_dir=data_dir,
-            embedding_model=embedding_model
+            embedding_model=embedding_model,
+            embedding_dtype=embedding_dtype
         )
-        print(f"✓ Semantic search tools initialized")
-        print(f"  - MCPProxy: {base_url}")
-        print(f"  - Data directory: {data_dir}")
-        print(f"  - Embedding model: {embedding_model}")
+        logger.info("✓ Semantic search tools initialized")
+        logger.info("  - MCPProxy: %s", base_url)
+        logger.info("  - Data directory: %s", data_dir)
+        logger.info("  - Embedding model: %s", embedding_model)
+        logger.info("  - Embedding dtype: %s", embedding_dtype)
 
         # Initialize semantic agent
         semantic_agent = SemanticSearchAgent(
             semantic_tools=semantic_tools,
             use_postgres=False  # Can be enabled via env var
         )
-        print(f"✓ Semantic search agent initialized")
+        logger.info("✓ Semantic search agent initialized")
 
         # Initial sync from mcpproxy
-        print("📥 Syncing tools from mcpproxy...")
-        indexed_count = semantic_tools.sync_from_mcpproxy()
-        print(f"✓ Indexed {indexed_count} tools")
+        logger.info("📥 Syncing tools from mcpproxy...")
+        indexed_count = await semantic_tools.sync_from_mcpproxy()
+        logger.info("✓ Indexed %d tools", indexed_count)
 
-    except Exception as e:
-        print(f"❌ Initialization failed: {e}")
-        import traceback
-        traceback.print_exc()
+        app.state.counts = await _read_counts()
+
+    except Exception:
+        logger.exception("❌ Initialization failed")
         sys.exit(1)
 
+    refresh_task = asyncio.create_task(_refresh_counts(app))
+
     yield
 
     # Cleanup on shutdown
-    print("🛑 Shutting down semantic search service...")
+    logger.info("🛑 Shutting down semantic search service...")
+    refresh_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await refresh_task
+    await app.state.http_client.aclose()
 
 
 app = FastAPI(
     title="MCPProxy Semantic Search API",
     description="Semantic tool discovery with RAG for mcpproxy",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -109,18 +167,17 @@ async def health_check():
     if not semantic_tools:
         raise HTTPException(status_code=503, detail="Service not initialized")
 
-    # Get collection counts
-    try:
-        tools_count = semantic_tools.tools_collection.count()
-        servers_count = semantic_tools.servers_collection.count()
+    # Counts are refreshed in the background; None means the last refresh failed
+    counts = app.state.counts
+    if counts is None:
+        raise HTTPException(status_code=500, detail="Health check failed: collection counts unavailable")
 
-        return HealthResponse(
-            status="healthy",
-            tools_indexed=tools_count,
-            servers_indexed=servers_count
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Health check failed: {str(e)}")
+    tools_count, servers_count = counts
+    return HealthResponse(
+        status="healthy",
+        tools_indexed=tools_count,
+        servers_indexed=servers_count
+    )
 
 
 @app.post("/api/semantic-search", response_model=SearchResponse)
@@ -154,7 +211,7 @@ async def sync_tools():
         raise HTTPException(status_code=503, detail="Service not initialized")
 
     try:
-        indexed_count = semantic_tools.sync_from_mcpproxy()
+        indexed_count = await semantic_tools.sync_from_mcpproxy()
 
         return SyncResponse(
             success=True,
@@ -189,7 +246,7 @@ async def index_server(request: ServerSummaryRequest):
 
         semantic_tools.index_server_summary(server_summary)
 
-        return JSONResponse(
+        return ORJSONResponse(
             content={
                 "success": True,
                 "message": f"Indexed server: {request.server_name}"
@@ -200,33 +257,89 @@ async def index_server(request: ServerSummaryRequest):
         raise HTTPException(status_code=500, detail=f"Index server failed: {str(e)}")
 
 
+async def _servers_etag() -> str:
+    """Build the ETag for the current version of the servers collection.
+
+    The version lives in ChromaDB, so writes from other processes (such as
+    summarize_server_docs.py) change it too.
+    """
+    return f'"{await asyncio.to_thread(semantic_tools.servers_version)}"'
+
+
 @app.get("/api/servers")
-async def list_servers():
-    """List indexed MCP servers."""
+async def list_servers(
+    request: Request,
+    limit: int = Query(SERVERS_PAGE_DEFAULT, ge=1, le=SERVERS_PAGE_MAX),
+    offset: int = Query(0, ge=0)
+):
+    """List indexed MCP servers, one page at a time.
+
+    Responses carry an ETag that changes whenever a server is indexed;
+    clients sending a matching If-None-Match get 304 Not Modified.
+
+    Args:
+        request: Incoming request, read for If-None-Match
+        limit: Maximum number of servers to return
+        offset: Number of servers to skip
+
+    Returns:
+        Page of servers and the offset of the next page, or None when
+        this is the last page
+    """
     if not semantic_tools:
         raise HTTPException(status_code=503, detail="Service not initialized")
 
+    etag = await _servers_etag()
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    page_key = (etag, limit, offset)
+    cached = app.state.servers_cache.get(page_key)
+    if cached is not None:
+        return Response(
+            content=cached,
+            media_type="application/json",
+            headers={"ETag": etag}
+        )
+
     try:
-        results = semantic_tools.servers_collection.get(
-            include=["metadatas", "documents"]
+        results = await asyncio.to_thread(
+            semantic_tools.servers_collection.get,
+            include=["metadatas"],
+            limit=limit,
+            offset=offset
         )
 
-        if not results or not results['ids']:
-            return JSONResponse(content={"servers": []})
+        ids = results['ids'] if results else []
+        metadatas = (results['metadatas'] if results else None) or [{}] * len(ids)
 
         servers = []
-        for i, server_id in enumerate(results['ids']):
-            metadata = results['metadatas'][i] if results['metadatas'] else {}
-            document = results['documents'][i] if results['documents'] else ""
+        for server_id, metadata in zip(ids, metadatas):
+            metadata = metadata or {}
+            caps = metadata.get("capabilities") or ""
+            uses = metadata.get("use_cases") or ""
 
             servers.append({
                 "server_name": server_id,
                 "summary": metadata.get("summary", ""),
-                "capabilities": metadata.get("capabilities", "").split(",") if metadata.get("capabilities") else [],
-                "use_cases": metadata.get("use_cases", "").split(",") if metadata.get("use_cases") else []
+                "capabilities": caps.split(",") if caps else [],
+                "use_cases": uses.split(",") if uses else []
             })
 
-        return JSONResponse(content={"servers": servers})
+        response = ORJSONResponse(
+            content={
+                "servers": servers,
+                "next_offset": offset + limit if len(servers) == limit else None
+            },
+            headers={"ETag": etag}
+        )
+
+        # Drop pages from older generations, and everything once full
+        cache = app.state.servers_cache
+        if len(cache) >= SERVERS_CACHE_PAGES or any(key[0] != etag for key in cache):
+            cache.clear()
+        cache[page_key] = response.body
+        return response
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"List servers failed: {str(e)}")
@@ -254,13 +367,21 @@ def main():
     port = int(os.getenv("SEMANTIC_SEARCH_PORT", "8081"))
     host = os.getenv("SEMANTIC_SEARCH_HOST", "127.0.0.1")
 
-    print(f"🌐 Starting semantic search API on {host}:{port}")
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(levelname)s:     %(name)s - %(message)s"
+    )
+    logger.info("🌐 Starting semantic search API on %s:%d", host, port)
 
+    # A single worker: each extra process would load its own embedding model
+    # and search matrices and repeat the startup sync
     uvicorn.run(
         app,
         host=host,
         port=port,
-        log_level="info"
+        log_level="info",
+        loop=os.getenv("UVICORN_LOOP", "uvloop" if UVLOOP_AVAILABLE else "asyncio"),
+        http=os.getenv("UVICORN_HTTP", "httptools" if HTTPTOOLS_AVAILABLE else "h11")
     )
 
 
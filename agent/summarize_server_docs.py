@@ -7,47 +7,173 @@ for semantic search agent to use when disambiguating similar tools.
 
 import argparse
 import asyncio
+import bisect
+import hashlib
+import itertools
+import json
+import os
+import re
 import sys
-from typing import List, Dict, Optional
+import time
+import traceback
+from pathlib import Path
+from typing import Any, List, Dict, Optional
 import httpx
 from bs4 import BeautifulSoup
 
+from mcp_agent.tools.http_client import HTTP2_AVAILABLE
 from mcp_agent.tools.semantic_search import SemanticSearchTools, ServerSummary
 
+# Prefer the C-backed lxml parser; fall back to the pure-Python stdlib one
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Elements whose text never belongs in a documentation summary
+_NON_CONTENT_TAGS = ["script", "style", "nav", "footer", "svg", "noscript"]
+
+
+def collapse_whitespace(text: str) -> str:
+    """Collapse whitespace runs (including non-breaking spaces) to single spaces.
+
+    str.split() with no separator is CPython's fastest whitespace
+    tokenizer, ahead of an equivalent regex substitution.
+    """
+    return ' '.join(text.split())
+
+
+# Sentence boundaries: terminal punctuation, whitespace, then a capital or
+# digit, so abbreviations like "e.g." and numbers like 3.14 stay intact
+_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9])')
+
+# Documentation fetches go to many hosts at once; bound them per run
+FETCH_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+FETCH_TIMEOUT = httpx.Timeout(30.0, connect=5.0, write=10.0)
+
+# Transient failures are retried: connection errors by the transport, and
+# these statuses by fetch_url with exponential backoff (seconds)
+FETCH_RETRIES = 3
+FETCH_BACKOFF = 0.5
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+# Fetched summaries are reused for this long (seconds) before revalidating
+DOC_CACHE_DIR = "~/.mcpproxy/doc_cache"
+DOC_CACHE_TTL = 7 * 24 * 3600
+
+
+class DocumentationCache:
+    """On-disk cache of documentation summaries keyed by URL."""
+
+    def __init__(self, cache_dir: str = DOC_CACHE_DIR, ttl: float = DOC_CACHE_TTL):
+        """Initialize cache.
+
+        Args:
+            cache_dir: Directory holding one JSON file per URL
+            ttl: Seconds an entry is served without revalidation
+        """
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.ttl = ttl
+
+    def _path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.blake2b(url.encode()).hexdigest()}.json"
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Load the entry for url, or None if missing or unreadable."""
+        try:
+            with open(self._path(url), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Check whether an entry is still within its TTL."""
+        return time.time() - entry.get("fetched_at", 0) < self.ttl
+
+    def put(self, url: str, entry: Dict[str, Any]) -> None:
+        """Store the entry for url, replacing the file atomically."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(url)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+
+def create_fetch_client() -> httpx.AsyncClient:
+    """Create the pooled client used for documentation fetches."""
+    return httpx.AsyncClient(
+        transport=httpx.AsyncHTTPTransport(
+            http2=HTTP2_AVAILABLE,
+            limits=FETCH_LIMITS,
+            retries=FETCH_RETRIES
+        ),
+        timeout=FETCH_TIMEOUT,
+        follow_redirects=True
+    )
+
 
 class DocumentationSummarizer:
     """Fetch and summarize MCP server documentation."""
 
-    def __init__(self):
-        self.client = httpx.AsyncClient(timeout=30.0, follow_redirects=True)
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[DocumentationCache] = None
+    ):
+        """Initialize summarizer.
+
+        Args:
+            client: Shared HTTP client; when omitted one is created on the
+                first fetch and closed by close() or on context exit
+            cache: Summary cache; nothing is cached when omitted
+        """
+        self._owns_client = client is None
+        self.client = client
+        self.cache = cache
+
+    async def __aenter__(self) -> "DocumentationSummarizer":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def fetch_url(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Optional[httpx.Response]:
+        """Fetch URL, returning the response (including 304) or None on failure."""
+        if self.client is None:
+            self.client = create_fetch_client()
 
-    async def fetch_url(self, url: str) -> Optional[str]:
-        """Fetch content from URL."""
         try:
-            response = await self.client.get(url)
-            response.raise_for_status()
-            return response.text
+            for attempt in range(FETCH_RETRIES + 1):
+                response = await self.client.get(url, headers=headers)
+                if response.status_code not in _RETRY_STATUSES or attempt == FETCH_RETRIES:
+                    break
+                await asyncio.sleep(FETCH_BACKOFF * 2 ** attempt)
+
+            if response.status_code != 304:
+                response.raise_for_status()
+            return response
         except Exception as e:
             print(f"Failed to fetch {url}: {e}")
             return None
 
     def extract_text(self, html: str) -> str:
         """Extract text content from HTML."""
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, HTML_PARSER)
 
-        # Remove script and style elements
-        for script in soup(["script", "style", "nav", "footer"]):
+        # Remove non-content elements. This has to happen after parsing: a
+        # SoupStrainer only filters top-level tags, so nested ones would
+        # survive it.
+        for script in soup(_NON_CONTENT_TAGS):
             script.decompose()
 
-        # Get text
-        text = soup.get_text()
-
-        # Clean up text
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
-
-        return text
+        return collapse_whitespace(soup.get_text())
 
     def generate_summary(self, text: str, max_length: int = 500) -> str:
         """Generate a summary from text.
@@ -55,17 +181,13 @@ class DocumentationSummarizer:
         This is a simple extraction-based summary. For production,
         you could use an LLM to generate better summaries.
         """
-        # For now, take the first meaningful paragraphs
-        sentences = text.split('.')
-        summary = ""
-
-        for sentence in sentences:
-            if len(summary) + len(sentence) < max_length:
-                summary += sentence.strip() + ". "
-            else:
-                break
+        # For now, take the leading sentences that fit in max_length,
+        # locating the cut on their cumulative space-joined length
+        sentences = [s for s in _SENTENCE_RE.split(text.strip()) if s]
+        lengths = list(itertools.accumulate(len(s) + 1 for s in sentences))
+        count = bisect.bisect_right(lengths, max_length + 1)
 
-        return summary.strip()
+        return ' '.join(sentences[:count])
 
     async def summarize_from_url(
         self,
@@ -76,14 +198,52 @@ class DocumentationSummarizer:
         print(f"\n📄 Fetching documentation for {server_name}...")
         print(f"   URL: {doc_url}")
 
-        html = await self.fetch_url(doc_url)
-        if not html:
-            return None
-
-        text = self.extract_text(html)
-        summary = self.generate_summary(text)
-
-        print(f"   ✓ Generated summary ({len(summary)} chars)")
+        entry = self.cache.get(doc_url) if self.cache else None
+
+        if entry and self.cache.is_fresh(entry):
+            summary = entry["summary"]
+            print(f"   ✓ Using cached summary ({len(summary)} chars)")
+        else:
+            # Revalidate a stale entry instead of downloading it again
+            headers = {}
+            if entry and entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry and entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+            response = await self.fetch_url(doc_url, headers=headers)
+            if response is None:
+                return None
+
+            if response.status_code == 304 and entry:
+                summary = entry["summary"]
+                print(f"   ✓ Documentation unchanged ({len(summary)} chars)")
+            elif not response.text:
+                return None
+            else:
+                # Only markup needs a parse tree; plain text, Markdown and
+                # JSON just get their whitespace collapsed
+                content_type = response.headers.get("content-type", "")
+                if not content_type or "html" in content_type or "xml" in content_type:
+                    text = self.extract_text(response.text)
+                else:
+                    text = collapse_whitespace(response.text)
+                summary = self.generate_summary(text)
+                print(f"   ✓ Generated summary ({len(summary)} chars)")
+
+            if self.cache:
+                previous = entry or {}
+                try:
+                    self.cache.put(doc_url, {
+                        "summary": summary,
+                        "etag": response.headers.get("etag", previous.get("etag")),
+                        "last_modified": response.headers.get(
+                            "last-modified", previous.get("last_modified")
+                        ),
+                        "fetched_at": time.time()
+                    })
+                except OSError as e:
+                    print(f"   ⚠️  Could not cache summary: {e}")
 
         return ServerSummary(
             server_name=server_name,
@@ -93,8 +253,10 @@ class DocumentationSummarizer:
         )
 
     async def close(self):
-        """Close HTTP client."""
-        await self.client.aclose()
+        """Close HTTP client if this summarizer created it."""
+        if self._owns_client and self.client is not None:
+            await self.client.aclose()
+            self.client = None
 
 
 # Predefined server documentation sources
@@ -269,6 +431,24 @@ KNOWN_SERVERS = {
     }
 }
 
+# KNOWN_SERVERS are static, so their summaries are built once at import
+KNOWN_SUMMARIES = {
+    key: ServerSummary(
+        server_name=data["name"],
+        summary=data["summary"],
+        capabilities=data["capabilities"],
+        typical_use_cases=data["use_cases"]
+    )
+    for key, data in KNOWN_SERVERS.items()
+}
+
+# Sorted names for --list and unknown-server messages, built once
+_KNOWN_NAMES = tuple(sorted(KNOWN_SERVERS))
+_KNOWN_NAMES_STR = ", ".join(_KNOWN_NAMES)
+
+# Case-insensitive lookup so "GitHub" and "github" resolve alike
+_SUMMARIES_BY_LOWER_NAME = {key.lower(): summary for key, summary in KNOWN_SUMMARIES.items()}
+
 
 async def main():
     """Main function."""
@@ -282,11 +462,18 @@ async def main():
     )
     parser.add_argument(
         "--url",
-        help="Documentation URL for custom server"
+        action="append",
+        help="Documentation URL for custom server (repeatable)"
     )
     parser.add_argument(
         "--custom-name",
-        help="Name for custom server (required with --url)"
+        action="append",
+        help="Name for custom server (one per --url, in the same order)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Fetch documentation even if a cached summary exists"
     )
     parser.add_argument(
         "--list",
@@ -299,7 +486,7 @@ async def main():
     # List known servers
     if args.list:
         print("Known MCP servers:")
-        for name in sorted(KNOWN_SERVERS.keys()):
+        for name in _KNOWN_NAMES:
             print(f"  - {name}")
         return 0
 
@@ -308,31 +495,33 @@ async def main():
     semantic_tools = SemanticSearchTools()
     print("✓ Semantic search tools initialized\n")
 
-    # Custom server from URL
+    # Custom servers from URLs
     if args.url:
-        if not args.custom_name:
-            print("Error: --custom-name required with --url")
+        if not args.custom_name or len(args.custom_name) != len(args.url):
+            print("Error: --custom-name required for each --url")
             return 1
 
-        summarizer = DocumentationSummarizer()
+        jobs = list(zip(args.custom_name, args.url))
 
-        try:
-            summary = await summarizer.summarize_from_url(
-                server_name=args.custom_name,
-                doc_url=args.url
-            )
+        # Fetch all documentation concurrently over one pooled client
+        cache = None if args.no_cache else DocumentationCache()
+        async with DocumentationSummarizer(cache=cache) as summarizer:
+            summaries = await asyncio.gather(*(
+                summarizer.summarize_from_url(server_name=name, doc_url=url)
+                for name, url in jobs
+            ))
+
+        semantic_tools.index_server_summaries([summary for summary in summaries if summary])
 
+        failed = 0
+        for (name, url), summary in zip(jobs, summaries):
             if summary:
-                semantic_tools.index_server_summary(summary)
-                print(f"✓ Indexed {args.custom_name} from {args.url}")
+                print(f"✓ Indexed {name} from {url}")
             else:
-                print(f"✗ Failed to summarize {args.custom_name}")
-                return 1
+                print(f"✗ Failed to summarize {name}")
+                failed += 1
 
-        finally:
-            await summarizer.close()
-
-        return 0
+        return 1 if failed else 0
 
     # Index known servers
     servers_to_index = args.servers if args.servers else list(KNOWN_SERVERS.keys())
@@ -341,32 +530,29 @@ async def main():
     print("Indexing MCP Server Documentation Summaries")
     print("=" * 70)
 
-    indexed_count = 0
+    summaries = []
 
     for server_name in servers_to_index:
-        if server_name not in KNOWN_SERVERS:
+        summary = _SUMMARIES_BY_LOWER_NAME.get(server_name.lower())
+        if summary is None:
             print(f"\n⚠️  Unknown server: {server_name}")
-            print(f"   Known servers: {', '.join(KNOWN_SERVERS.keys())}")
+            print(f"   Known servers: {_KNOWN_NAMES_STR}")
             continue
 
-        server_data = KNOWN_SERVERS[server_name]
+        summaries.append(summary)
 
-        summary = ServerSummary(
-            server_name=server_data["name"],
-            summary=server_data["summary"],
-            capabilities=server_data["capabilities"],
-            typical_use_cases=server_data["use_cases"]
-        )
-
-        try:
-            semantic_tools.index_server_summary(summary)
-            print(f"\n✓ Indexed {server_name}")
-            print(f"   Capabilities: {', '.join(server_data['capabilities'][:3])}...")
-            print(f"   Use cases: {len(server_data['use_cases'])} examples")
-            indexed_count += 1
+    # Embed and store every summary in one batch
+    indexed_count = 0
+    try:
+        indexed_count = semantic_tools.index_server_summaries(summaries)
+    except Exception as e:
+        print(f"\n✗ Failed to index servers: {e}")
 
-        except Exception as e:
-            print(f"\n✗ Failed to index {server_name}: {e}")
+    if indexed_count:
+        for summary in summaries:
+            print(f"\n✓ Indexed {summary.server_name}")
+            print(f"   Capabilities: {', '.join(summary.capabilities[:3])}...")
+            print(f"   Use cases: {len(summary.typical_use_cases)} examples")
 
     # Summary
     print("\n" + "=" * 70)
@@ -394,6 +580,5 @@ if __name__ == "__main__":
         sys.exit(1)
     except Exception as e:
         print(f"\n❌ Error: {e}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)
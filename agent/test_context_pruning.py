@@ -2,13 +2,26 @@
 """Test script to verify context pruning functionality."""
 
 import asyncio
+import json
 import sys
+import traceback
+from collections import Counter
 from mcp_agent.tools.diagnostic import DiagnosticTools, MCPProxyClient
 from mcp_agent.tools.config import ConfigTools
 from mcp_agent.graph.agent_graph import MCPAgentGraph, AgentInput
 from mcp_agent.graph.context_pruning import ContextPruner
 
 
+class _SizeCounter:
+    """Write-only sink that counts the characters json.dump streams into it."""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, chunk: str) -> None:
+        self.size += len(chunk)
+
+
 async def test_basic_pruning():
     """Test basic pruning logic."""
     print("=" * 70)
@@ -80,7 +93,6 @@ async def test_agent_pruning():
 
     # Use specific thread_id
     thread_id = "test-pruning-session"
-    config = {"configurable": {"thread_id": thread_id}}
 
     # Send enough messages to potentially trigger pruning
     # Even with pruning, first few won't trigger it
@@ -104,36 +116,37 @@ async def test_agent_pruning():
         result = await agent.run(AgentInput(request=msg), thread_id=thread_id)
 
         # Check conversation history size
-        checkpoints = list(agent.memory.list(config))
-        if checkpoints:
-            latest = checkpoints[0]
+        latest = await agent.get_latest_checkpoint(thread_id)
+        if latest is not None:
             state = latest.checkpoint["channel_values"]
             conv_history = state.get("conversation_history", [])
 
-            print(f"  Conversation history: {len(conv_history)} messages")
+            lines = [f"  Conversation history: {len(conv_history)} messages"]
 
-            # Calculate approximate size
-            import json
-            state_json = json.dumps(state, default=str)
-            state_size = len(state_json)
-            print(f"  State size: {state_size:,} bytes ({state_size/1024:.1f} KB)")
+            # Calculate approximate size without building the JSON string
+            counter = _SizeCounter()
+            json.dump(state, counter, default=str)
+            state_size = counter.size
+            lines.append(f"  State size: {state_size:,} bytes ({state_size/1024:.1f} KB)")
 
             # Check if pruning happened
             if len(conv_history) < i:
-                print(f"  ✂️  Pruning detected! {i} messages sent, {len(conv_history)} retained")
+                lines.append(f"  ✂️  Pruning detected! {i} messages sent, {len(conv_history)} retained")
             elif i > ContextPruner.RECENT_MESSAGE_COUNT + 5:
                 # After many messages, we expect pruning
                 if len(conv_history) == i:
-                    print(f"  ⚠️  No pruning yet (may need more messages)")
+                    lines.append(f"  ⚠️  No pruning yet (may need more messages)")
+
+            # One write per message instead of one per line
+            sys.stdout.write("\n".join(lines) + "\n")
 
     # Final check
     print("\n" + "=" * 70)
     print("Final State Analysis")
     print("=" * 70)
 
-    checkpoints = list(agent.memory.list(config))
-    if checkpoints:
-        latest = checkpoints[0]
+    latest = await agent.get_latest_checkpoint(thread_id)
+    if latest is not None:
         state = latest.checkpoint["channel_values"]
         conv_history = state.get("conversation_history", [])
 
@@ -149,10 +162,7 @@ async def test_agent_pruning():
 
         # Show distribution
         print(f"\nMessage distribution:")
-        roles = {}
-        for msg in conv_history:
-            role = msg.get("role", "unknown")
-            roles[role] = roles.get(role, 0) + 1
+        roles = Counter(msg.get("role", "unknown") for msg in conv_history)
 
         for role, count in roles.items():
             print(f"  {role}: {count} messages")
@@ -255,7 +265,6 @@ async def main():
 
     except Exception as e:
         print(f"\n❌ Error during testing: {e}")
-        import traceback
         traceback.print_exc()
         return 1
 
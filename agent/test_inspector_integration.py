@@ -13,11 +13,40 @@ from mcp_agent.tools.inspector import InspectorTools
 from mcp_agent.graph.agent_graph import MCPAgentGraph, AgentInput
 
 
+def emit(lines):
+    """Write a block of output lines with a single stdout write."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def section(title, request, leading_newline=False):
+    """Format a test section header followed by the user's request."""
+    return [
+        ("\n" if leading_newline else "") + "=" * 70,
+        title,
+        "=" * 70,
+        f"User: '{request}'\n",
+    ]
+
+
+def format_result(result):
+    """Format an agent result as output lines."""
+    lines = [
+        f"Agent Response: {result.response}",
+        f"Actions Taken: {result.actions_taken}",
+    ]
+    if result.recommendations:
+        lines.append("Recommendations:")
+        lines.extend(f"  - {rec}" for rec in result.recommendations)
+    return lines
+
+
 async def main():
     """Test the inspector integration."""
-    print("=" * 70)
-    print("Testing MCP Inspector Integration with Python Agent")
-    print("=" * 70)
+    emit([
+        "=" * 70,
+        "Testing MCP Inspector Integration with Python Agent",
+        "=" * 70,
+    ])
 
     # Initialize tools
     client = MCPProxyClient(base_url="http://localhost:8080")
@@ -35,103 +64,59 @@ async def main():
     agent = MCPAgentGraph(tools_registry)
     thread_id = "inspector-test-session"
 
-    print("\n✓ Agent initialized with inspector tools\n")
+    emit(["\n✓ Agent initialized with inspector tools\n"])
 
     # Test 1: Start the inspector
-    print("=" * 70)
-    print("Test 1: Starting MCP Inspector")
-    print("=" * 70)
-    print("User: 'Start the inspector so I can watch the interaction'\n")
-
-    result = await agent.run(
-        AgentInput(request="Start the inspector so I can watch the interaction"),
-        thread_id=thread_id
-    )
-
-    print(f"Agent Response: {result.response}")
-    print(f"Actions Taken: {result.actions_taken}")
-    if result.recommendations:
-        print("Recommendations:")
-        for rec in result.recommendations:
-            print(f"  - {rec}")
+    request = "Start the inspector so I can watch the interaction"
+    emit(section("Test 1: Starting MCP Inspector", request))
+    result = await agent.run(AgentInput(request=request), thread_id=thread_id)
+    emit(format_result(result))
 
     # Wait a bit for inspector to fully start
     await asyncio.sleep(2)
 
     # Test 2: Check inspector status
-    print("\n" + "=" * 70)
-    print("Test 2: Checking Inspector Status")
-    print("=" * 70)
-    print("User: 'Is the inspector running?'\n")
-
-    result = await agent.run(
-        AgentInput(request="Is the inspector running?"),
-        thread_id=thread_id
-    )
-
-    print(f"Agent Response: {result.response}")
-    print(f"Actions Taken: {result.actions_taken}")
-    if result.recommendations:
-        print("Recommendations:")
-        for rec in result.recommendations:
-            print(f"  - {rec}")
+    request = "Is the inspector running?"
+    emit(section("Test 2: Checking Inspector Status", request, leading_newline=True))
+    result = await agent.run(AgentInput(request=request), thread_id=thread_id)
+    emit(format_result(result))
 
     # Test 3: User can now interact with the inspector
-    print("\n" + "=" * 70)
-    print("Inspector is Running - User Can Watch Live Interaction")
-    print("=" * 70)
-    print("At this point, the user can:")
-    print("  1. Open the inspector URL in their browser")
-    print("  2. Chat with the agent and watch the MCP protocol in real-time")
-    print("  3. See tool calls, responses, and server interactions")
-    print()
+    emit([
+        "\n" + "=" * 70,
+        "Inspector is Running - User Can Watch Live Interaction",
+        "=" * 70,
+        "At this point, the user can:",
+        "  1. Open the inspector URL in their browser",
+        "  2. Chat with the agent and watch the MCP protocol in real-time",
+        "  3. See tool calls, responses, and server interactions",
+        "",
+    ])
 
     # Test 4: Stop the inspector
-    print("=" * 70)
-    print("Test 3: Stopping Inspector")
-    print("=" * 70)
-    print("User: 'Stop the inspector now'\n")
-
-    result = await agent.run(
-        AgentInput(request="Stop the inspector now"),
-        thread_id=thread_id
-    )
-
-    print(f"Agent Response: {result.response}")
-    print(f"Actions Taken: {result.actions_taken}")
-    if result.recommendations:
-        print("Recommendations:")
-        for rec in result.recommendations:
-            print(f"  - {rec}")
+    request = "Stop the inspector now"
+    emit(section("Test 3: Stopping Inspector", request))
+    result = await agent.run(AgentInput(request=request), thread_id=thread_id)
+    emit(format_result(result))
 
     # Test 5: Verify inspector stopped
-    print("\n" + "=" * 70)
-    print("Test 4: Verifying Inspector Stopped")
-    print("=" * 70)
-    print("User: 'Check if the inspector is still running'\n")
-
-    result = await agent.run(
-        AgentInput(request="Check if the inspector is still running"),
-        thread_id=thread_id
-    )
-
-    print(f"Agent Response: {result.response}")
-    print(f"Actions Taken: {result.actions_taken}")
-    if result.recommendations:
-        print("Recommendations:")
-        for rec in result.recommendations:
-            print(f"  - {rec}")
-
-    print("\n" + "=" * 70)
-    print("Integration Test Summary")
-    print("=" * 70)
-    print("✅ Inspector can be started via natural language")
-    print("✅ Inspector status can be checked conversationally")
-    print("✅ Inspector can be stopped via chat")
-    print("✅ User can watch live MCP protocol interaction")
-    print()
-    print("The agent now has full control of the MCP Inspector!")
-    print("=" * 70)
+    request = "Check if the inspector is still running"
+    emit(section("Test 4: Verifying Inspector Stopped", request, leading_newline=True))
+    result = await agent.run(AgentInput(request=request), thread_id=thread_id)
+    emit(format_result(result))
+
+    emit([
+        "\n" + "=" * 70,
+        "Integration Test Summary",
+        "=" * 70,
+        "✅ Inspector can be started via natural language",
+        "✅ Inspector status can be checked conversationally",
+        "✅ Inspector can be stopped via chat",
+        "✅ User can watch live MCP protocol interaction",
+        "",
+        "The agent now has full control of the MCP Inspector!",
+        "=" * 70,
+    ])
 
     return 0
 
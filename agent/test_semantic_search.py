@@ -60,9 +60,6 @@ async def main():
         ]
     )
 
-    semantic_tools.index_server_summary(github_summary)
-    print("✓ Indexed GitHub server documentation")
-
     # Example: Filesystem server
     filesystem_summary = ServerSummary(
         server_name="filesystem",
@@ -84,7 +81,9 @@ async def main():
         ]
     )
 
-    semantic_tools.index_server_summary(filesystem_summary)
+    # Embed both summaries in a single model call
+    semantic_tools.index_server_summaries([github_summary, filesystem_summary])
+    print("✓ Indexed GitHub server documentation")
     print("✓ Indexed Filesystem server documentation")
 
     # Step 2: Sync tools from mcpproxy
@@ -92,7 +91,7 @@ async def main():
     print("Step 2: Syncing Tools from MCPProxy")
     print("=" * 70)
 
-    indexed_count = semantic_tools.sync_from_mcpproxy()
+    indexed_count = await semantic_tools.sync_from_mcpproxy()
     print(f"✓ Indexed {indexed_count} tools from mcpproxy")
 
     # Step 3: Test semantic search
@@ -198,17 +197,17 @@ async def main():
         "deploy application",
     ]
 
-    for query in natural_queries:
-        print(f'\n🔍 Query: "{query}"')
-
-        request = SearchRequest(
-            query=query,
-            mode="hybrid",
-            limit=3,
-            include_reasoning=False
-        )
+    # Embed all queries in one batch and run the searches concurrently
+    results = await agent.search_many(
+        [
+            SearchRequest(query=query, mode="hybrid", limit=3, include_reasoning=False)
+            for query in natural_queries
+        ],
+        thread_ids=[f"test-{query.replace(' ', '-')}" for query in natural_queries]
+    )
 
-        result = await agent.search(request, thread_id=f"test-{query.replace(' ', '-')}")
+    for query, result in zip(natural_queries, results):
+        print(f'\n🔍 Query: "{query}"')
 
         if result.total > 0:
             top_tool = result.tools[0]
@@ -217,6 +216,9 @@ async def main():
         else:
             print("   No results found")
 
+    cache_info = semantic_tools.query_cache_info()
+    print(f"\nQuery embedding cache: {cache_info['hits']} hits, {cache_info['misses']} misses")
+
     # Summary
     print("\n" + "=" * 70)
     print("Semantic Search Test Summary")
@@ -8,13 +8,12 @@ from mcp_agent.tools.config import ConfigTools
 from mcp_agent.graph.agent_graph import MCPAgentGraph, AgentInput
 
 
-async def test_session_persistence():
-    """Test that conversation history persists across multiple calls."""
-    print("=" * 70)
-    print("Testing Session Memory Persistence")
-    print("=" * 70)
+def build_agent() -> MCPAgentGraph:
+    """Build the agent shared by all tests.
 
-    # Initialize agent
+    Each test uses its own thread_id, so one graph (and its checkpointer)
+    serves the whole run instead of recompiling the graph per test.
+    """
     client = MCPProxyClient(base_url="http://localhost:8080")
     diagnostic_tools = DiagnosticTools(mcpproxy_client=client)
     config_tools = ConfigTools(base_url="http://localhost:8080")
@@ -24,11 +23,17 @@ async def test_session_persistence():
         "config": config_tools,
     }
 
-    agent = MCPAgentGraph(tools_registry)
+    return MCPAgentGraph(tools_registry)
+
+
+async def test_session_persistence(agent: MCPAgentGraph):
+    """Test that conversation history persists across multiple calls."""
+    print("=" * 70)
+    print("Testing Session Memory Persistence")
+    print("=" * 70)
 
     # Use a specific thread_id to maintain session
     thread_id = "test-session-123"
-    config = {"configurable": {"thread_id": thread_id}}
 
     # Message 1
     print("\n[Message 1] Sending first message...")
@@ -36,10 +41,9 @@ async def test_session_persistence():
     print(f"Response 1: {result1.response[:100]}...")
 
     # Check conversation history after message 1
-    checkpoints = list(agent.memory.list(config))
-    print(f"\nCheckpoints after message 1: {len(checkpoints)}")
-    if checkpoints:
-        latest = checkpoints[0]
+    latest = await agent.get_latest_checkpoint(thread_id)
+    print(f"\nCheckpoint after message 1: {'found' if latest else 'missing'}")
+    if latest:
         state = latest.checkpoint["channel_values"]
         conv_history = state.get("conversation_history", [])
         print(f"Conversation history length: {len(conv_history)}")
@@ -51,10 +55,9 @@ async def test_session_persistence():
     print(f"Response 2: {result2.response[:100]}...")
 
     # Check conversation history after message 2
-    checkpoints = list(agent.memory.list(config))
-    print(f"\nCheckpoints after message 2: {len(checkpoints)}")
-    if checkpoints:
-        latest = checkpoints[0]
+    latest = await agent.get_latest_checkpoint(thread_id)
+    print(f"\nCheckpoint after message 2: {'found' if latest else 'missing'}")
+    if latest:
         state = latest.checkpoint["channel_values"]
         conv_history = state.get("conversation_history", [])
         print(f"Conversation history length: {len(conv_history)}")
@@ -71,27 +74,14 @@ async def test_session_persistence():
     return True
 
 
-async def test_context_growth():
+async def test_context_growth(agent: MCPAgentGraph):
     """Test how conversation history grows with multiple messages."""
     print("\n" + "=" * 70)
     print("Testing Context Growth & Compaction")
     print("=" * 70)
 
-    # Initialize agent
-    client = MCPProxyClient(base_url="http://localhost:8080")
-    diagnostic_tools = DiagnosticTools(mcpproxy_client=client)
-    config_tools = ConfigTools(base_url="http://localhost:8080")
-
-    tools_registry = {
-        "diagnostic": diagnostic_tools,
-        "config": config_tools,
-    }
-
-    agent = MCPAgentGraph(tools_registry)
-
     # Use a specific thread_id
     thread_id = "test-growth-456"
-    config = {"configurable": {"thread_id": thread_id}}
 
     # Send multiple messages to test growth
     messages = [
@@ -109,9 +99,8 @@ async def test_context_growth():
         result = await agent.run(AgentInput(request=msg), thread_id=thread_id)
 
         # Check state size
-        checkpoints = list(agent.memory.list(config))
-        if checkpoints:
-            latest = checkpoints[0]
+        latest = await agent.get_latest_checkpoint(thread_id)
+        if latest:
             state = latest.checkpoint["channel_values"]
             conv_history = state.get("conversation_history", [])
 
@@ -131,9 +120,8 @@ async def test_context_growth():
     print("\n✅ Context growth test complete")
 
     # Check if compaction is implemented
-    checkpoints = list(agent.memory.list(config))
-    if checkpoints:
-        latest = checkpoints[0]
+    latest = await agent.get_latest_checkpoint(thread_id)
+    if latest:
         state = latest.checkpoint["channel_values"]
         conv_history = state.get("conversation_history", [])
 
@@ -154,24 +142,12 @@ async def test_context_growth():
     return False
 
 
-async def test_checkpoint_retrieval():
+async def test_checkpoint_retrieval(agent: MCPAgentGraph):
     """Test retrieving previous checkpoints."""
     print("\n" + "=" * 70)
     print("Testing Checkpoint Retrieval")
     print("=" * 70)
 
-    # Initialize agent
-    client = MCPProxyClient(base_url="http://localhost:8080")
-    diagnostic_tools = DiagnosticTools(mcpproxy_client=client)
-    config_tools = ConfigTools(base_url="http://localhost:8080")
-
-    tools_registry = {
-        "diagnostic": diagnostic_tools,
-        "config": config_tools,
-    }
-
-    agent = MCPAgentGraph(tools_registry)
-
     # Create a session with specific thread_id
     thread_id = "test-checkpoint-789"
     config = {"configurable": {"thread_id": thread_id}}
@@ -199,6 +175,9 @@ async def test_checkpoint_retrieval():
             conv_history = state.get("conversation_history", [])
             print(f"  Conversation history length: {len(conv_history)}")
 
+    # Drop this thread's checkpoints from the shared checkpointer
+    agent.memory.delete_thread(thread_id)
+
     print("\n✅ Checkpoint retrieval test complete")
     return True
 
@@ -208,14 +187,16 @@ async def main():
     print("\n🧪 MCP Agent Session Memory & Context Tests\n")
 
     try:
+        agent = build_agent()
+
         # Test 1: Session persistence
-        await test_session_persistence()
+        await test_session_persistence(agent)
 
         # Test 2: Context growth
-        await test_context_growth()
+        await test_context_growth(agent)
 
         # Test 3: Checkpoint retrieval
-        await test_checkpoint_retrieval()
+        await test_checkpoint_retrieval(agent)
 
         print("\n" + "=" * 70)
         print("📋 Test Summary")
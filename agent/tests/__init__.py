@@ -22,7 +22,7 @@ Running Tests:
 - E2E tests: pytest -m e2e
 - Specific tool: pytest -m diagnostic
 - With coverage: pytest --cov=mcp_agent
-- Parallel: pytest -n auto (requires pytest-xdist)
+- Parallel: pytest -n auto --dist=loadscope (requires pytest-xdist)
 """
 
 __version__ = "0.1.0"
@@ -1,49 +1,56 @@
 """Pytest configuration and shared fixtures for MCP Agent tests."""
 
-import asyncio
+import json
+import logging
+import socket
 from datetime import datetime
-from typing import Any, AsyncGenerator, Dict, List
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Tuple
 from unittest.mock import AsyncMock, MagicMock, Mock
 
 import httpx
 import pytest
 from httpx import AsyncClient, Response
 
+from mcp_agent.graph.agent_graph import MCPAgentGraph
+from mcp_agent.tools.diagnostic import DiagnosticTools, MCPProxyClient
+
 
 # ============================================================================
 # Pytest Configuration
 # ============================================================================
 
 
-def pytest_configure(config):
-    """Configure pytest with custom settings."""
-    config.addinivalue_line(
-        "markers",
-        "unit: Unit tests for individual components",
-    )
-    config.addinivalue_line(
-        "markers",
-        "integration: Integration tests for workflows",
-    )
-    config.addinivalue_line(
-        "markers",
-        "e2e: End-to-end test scenarios",
+def pytest_addoption(parser):
+    """Add command-line options for opt-in test groups."""
+    parser.addoption(
+        "--run-api",
+        action="store_true",
+        default=False,
+        help="Run tests marked requires_api against a live mcpproxy",
     )
 
 
+def pytest_collection_modifyitems(config, items):
+    """Skip requires_api tests unless --run-api is given.
+
+    The skip is attached at collection time, so their fixtures (including
+    the live API probe) and event loop are never set up.
+    """
+    if config.getoption("--run-api"):
+        return
+
+    skip_api = pytest.mark.skip(reason="needs --run-api")
+    for item in items:
+        if "requires_api" in item.keywords:
+            item.add_marker(skip_api)
+
+
 # ============================================================================
 # Session-Scoped Fixtures (Shared Across All Tests)
 # ============================================================================
 
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create event loop for async tests."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
-
-
 @pytest.fixture(scope="session")
 def base_url() -> str:
     """Base URL for mcpproxy API."""
@@ -56,29 +63,45 @@ def api_token() -> str:
     return "test-api-token-12345"
 
 
+@pytest.fixture(scope="session")
+def _mcpproxy_client_singleton():
+    """Mock MCPProxyClient built once; mock_mcpproxy_client resets it per test."""
+    return _build_mock_mcpproxy_client(_build_mock_httpx_client())
+
+
+@pytest.fixture(scope="session")
+def mcpproxy_api_client(base_url):
+    """MCPProxyClient for a live mcpproxy, probed once per session.
+
+    Skips every dependent test immediately when nothing is listening at
+    base_url, instead of each test waiting on its own failed request.
+    """
+    url = httpx.URL(base_url)
+    try:
+        socket.create_connection((url.host, url.port), timeout=0.5).close()
+    except OSError as e:
+        pytest.skip(f"API not available: {e}")
+
+    return MCPProxyClient(base_url=base_url)
+
+
 # ============================================================================
 # Function-Scoped Fixtures (Fresh Instance Per Test)
 # ============================================================================
 
 
-@pytest.fixture
-def mock_httpx_client() -> AsyncMock:
-    """Create a mock httpx.AsyncClient for testing."""
+def _build_mock_httpx_client() -> AsyncMock:
     client = AsyncMock(spec=AsyncClient)
     client.base_url = "http://localhost:8080"
     client.headers = {}
     return client
 
 
-@pytest.fixture
-def mock_mcpproxy_client(mock_httpx_client):
-    """Create a mock MCPProxyClient for testing."""
-    from mcp_agent.tools.diagnostic import MCPProxyClient
-
+def _build_mock_mcpproxy_client(http_client: AsyncMock) -> Mock:
     client = Mock(spec=MCPProxyClient)
     client.base_url = "http://localhost:8080"
     client.headers = {}
-    client.client = mock_httpx_client
+    client.client = http_client
 
     # Mock common methods
     client.get_server_logs = AsyncMock()
@@ -88,216 +111,261 @@ def mock_mcpproxy_client(mock_httpx_client):
     return client
 
 
+@pytest.fixture
+def mock_httpx_client() -> AsyncMock:
+    """Create a mock httpx.AsyncClient for testing."""
+    return _build_mock_httpx_client()
+
+
+@pytest.fixture
+def mock_mcpproxy_client(_mcpproxy_client_singleton):
+    """Mock MCPProxyClient with calls, return values and side effects reset."""
+    _mcpproxy_client_singleton.reset_mock(return_value=True, side_effect=True)
+    return _mcpproxy_client_singleton
+
+
+# ============================================================================
+# Class-Scoped Fixtures (Shared Within a Test Class)
+# ============================================================================
+
+
+@pytest.fixture(scope="class")
+def class_mock_mcpproxy_client():
+    """Mock MCPProxyClient shared by the tests of one class.
+
+    Lets class-scoped fixtures (tool registries, compiled agents) be built
+    once per class. Reset call records between tests with reset_mock().
+    """
+    return _build_mock_mcpproxy_client(_build_mock_httpx_client())
+
+
 # ============================================================================
 # Test Data Fixtures
 # ============================================================================
+#
+# Sample payloads are built once per session and deeply frozen (read-only
+# mappings, tuples), so a test cannot leak changes into the next one.
+# make_response encodes them as they are; use _thaw(...) or
+# mutable_log_entries when a test needs a modifiable copy.
 
 
-@pytest.fixture
-def sample_server_config() -> Dict[str, Any]:
+def _freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Inverse of _freeze: rebuild plain, modifiable dicts and lists."""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+@pytest.fixture(scope="session")
+def sample_server_config() -> Mapping[str, Any]:
     """Sample MCP server configuration."""
-    return {
-        "name": "test-server",
-        "url": "https://api.test.com/mcp",
-        "protocol": "http",
-        "enabled": True,
-        "quarantined": False,
-        "headers": {
-            "Authorization": "Bearer test-token",
-        },
-    }
+    return _freeze(
+        {
+            "name": "test-server",
+            "url": "https://api.test.com/mcp",
+            "protocol": "http",
+            "enabled": True,
+            "quarantined": False,
+            "headers": {
+                "Authorization": "Bearer test-token",
+            },
+        }
+    )
 
 
-@pytest.fixture
-def sample_stdio_server_config() -> Dict[str, Any]:
+@pytest.fixture(scope="session")
+def sample_stdio_server_config() -> Mapping[str, Any]:
     """Sample stdio MCP server configuration."""
-    return {
-        "name": "test-stdio-server",
-        "command": "npx",
-        "args": ["@modelcontextprotocol/server-test"],
-        "protocol": "stdio",
-        "enabled": True,
-        "quarantined": False,
-        "env": {
-            "API_KEY": "test-api-key",
-        },
-        "working_dir": "/home/user/projects/test",
-    }
+    return _freeze(
+        {
+            "name": "test-stdio-server",
+            "command": "npx",
+            "args": ["@modelcontextprotocol/server-test"],
+            "protocol": "stdio",
+            "enabled": True,
+            "quarantined": False,
+            "env": {
+                "API_KEY": "test-api-key",
+            },
+            "working_dir": "/home/user/projects/test",
+        }
+    )
 
 
-@pytest.fixture
-def sample_log_entries() -> List[Dict[str, Any]]:
+@pytest.fixture(scope="session")
+def sample_log_entries() -> Tuple[Mapping[str, Any], ...]:
     """Sample log entries for testing."""
-    return [
-        {
-            "timestamp": "2025-11-01T10:00:00Z",
-            "level": "INFO",
-            "server": "test-server",
-            "message": "Server started successfully",
-            "context": {},
-        },
-        {
-            "timestamp": "2025-11-01T10:01:00Z",
-            "level": "ERROR",
-            "server": "test-server",
-            "message": "Authentication failed: Invalid token",
-            "context": {"error_code": "auth_failed"},
-        },
-        {
-            "timestamp": "2025-11-01T10:02:00Z",
-            "level": "WARN",
-            "server": "test-server",
-            "message": "Connection timeout after 30s",
-            "context": {"retry_count": 3},
-        },
-        {
-            "timestamp": "2025-11-01T10:03:00Z",
-            "level": "ERROR",
-            "server": "test-server",
-            "message": "Authentication failed: Invalid token",
-            "context": {"error_code": "auth_failed"},
-        },
-        {
-            "timestamp": "2025-11-01T10:04:00Z",
-            "level": "CRITICAL",
-            "server": "test-server",
-            "message": "Server crashed: Out of memory",
-            "context": {},
-        },
-    ]
+    return _freeze(
+        [
+            {
+                "timestamp": "2025-11-01T10:00:00Z",
+                "level": "INFO",
+                "server": "test-server",
+                "message": "Server started successfully",
+                "context": {},
+            },
+            {
+                "timestamp": "2025-11-01T10:01:00Z",
+                "level": "ERROR",
+                "server": "test-server",
+                "message": "Authentication failed: Invalid token",
+                "context": {"error_code": "auth_failed"},
+            },
+            {
+                "timestamp": "2025-11-01T10:02:00Z",
+                "level": "WARN",
+                "server": "test-server",
+                "message": "Connection timeout after 30s",
+                "context": {"retry_count": 3},
+            },
+            {
+                "timestamp": "2025-11-01T10:03:00Z",
+                "level": "ERROR",
+                "server": "test-server",
+                "message": "Authentication failed: Invalid token",
+                "context": {"error_code": "auth_failed"},
+            },
+            {
+                "timestamp": "2025-11-01T10:04:00Z",
+                "level": "CRITICAL",
+                "server": "test-server",
+                "message": "Server crashed: Out of memory",
+                "context": {},
+            },
+        ]
+    )
 
 
 @pytest.fixture
-def sample_server_status() -> Dict[str, Any]:
+def mutable_log_entries(sample_log_entries) -> List[Dict[str, Any]]:
+    """Fresh, modifiable copy of the sample log entries."""
+    return _thaw(sample_log_entries)
+
+
+@pytest.fixture(scope="session")
+def sample_server_status() -> Mapping[str, Any]:
     """Sample server status response."""
-    return {
-        "name": "test-server",
-        "state": "Ready",
-        "is_connected": True,
-        "last_error": None,
-        "retry_count": 0,
-        "uptime": 3600,
-        "tools_count": 15,
-    }
+    return _freeze(
+        {
+            "name": "test-server",
+            "state": "Ready",
+            "is_connected": True,
+            "last_error": None,
+            "retry_count": 0,
+            "uptime": 3600,
+            "tools_count": 15,
+        }
+    )
 
 
-@pytest.fixture
-def sample_failed_server_status() -> Dict[str, Any]:
+@pytest.fixture(scope="session")
+def sample_failed_server_status() -> Mapping[str, Any]:
     """Sample failed server status response."""
-    return {
-        "name": "test-server",
-        "state": "Error",
-        "is_connected": False,
-        "last_error": "Authentication failed: OAuth token expired",
-        "retry_count": 5,
-        "uptime": 0,
-        "tools_count": 0,
-    }
+    return _freeze(
+        {
+            "name": "test-server",
+            "state": "Error",
+            "is_connected": False,
+            "last_error": "Authentication failed: OAuth token expired",
+            "retry_count": 5,
+            "uptime": 0,
+            "tools_count": 0,
+        }
+    )
 
 
-@pytest.fixture
-def sample_tool_list() -> List[Dict[str, Any]]:
+@pytest.fixture(scope="session")
+def sample_tool_list() -> Tuple[Mapping[str, Any], ...]:
     """Sample tool list response."""
-    return [
-        {
-            "name": "test-server:create_issue",
-            "description": "Create a new issue in the issue tracker",
-            "input_schema": {
-                "type": "object",
-                "properties": {
-                    "title": {"type": "string"},
-                    "description": {"type": "string"},
+    return _freeze(
+        [
+            {
+                "name": "test-server:create_issue",
+                "description": "Create a new issue in the issue tracker",
+                "input_schema": {
+                    "type": "object",
+                    "properties": {
+                        "title": {"type": "string"},
+                        "description": {"type": "string"},
+                    },
+                    "required": ["title"],
                 },
-                "required": ["title"],
             },
-        },
-        {
-            "name": "test-server:list_issues",
-            "description": "List all issues",
-            "input_schema": {
-                "type": "object",
-                "properties": {
-                    "status": {"type": "string", "enum": ["open", "closed", "all"]},
+            {
+                "name": "test-server:list_issues",
+                "description": "List all issues",
+                "input_schema": {
+                    "type": "object",
+                    "properties": {
+                        "status": {"type": "string", "enum": ["open", "closed", "all"]},
+                    },
                 },
             },
-        },
-    ]
+        ]
+    )
 
 
-@pytest.fixture
-def sample_oauth_config() -> Dict[str, Any]:
+@pytest.fixture(scope="session")
+def sample_oauth_config() -> Mapping[str, Any]:
     """Sample OAuth configuration."""
-    return {
-        "authorization_url": "https://auth.test.com/oauth/authorize",
-        "token_url": "https://auth.test.com/oauth/token",
-        "client_id": "test-client-id",
-        "scopes": ["read", "write"],
-    }
+    return _freeze(
+        {
+            "authorization_url": "https://auth.test.com/oauth/authorize",
+            "token_url": "https://auth.test.com/oauth/token",
+            "client_id": "test-client-id",
+            "scopes": ["read", "write"],
+        }
+    )
 
 
 # ============================================================================
 # HTTP Response Fixtures
 # ============================================================================
 
+# A real (cheap) request; responses only need it for raise_for_status()
+_FAKE_REQUEST = httpx.Request("GET", "http://localhost:8080")
+_JSON_HEADERS = {"Content-Type": "application/json"}
 
-@pytest.fixture
-def mock_server_logs_response(sample_log_entries) -> Response:
-    """Mock HTTP response for server logs endpoint."""
-    return Response(
-        status_code=200,
-        json=sample_log_entries,
-        request=Mock(),
-    )
-
-
-@pytest.fixture
-def mock_server_status_response(sample_server_status) -> Response:
-    """Mock HTTP response for server status endpoint."""
-    return Response(
-        status_code=200,
-        json=sample_server_status,
-        request=Mock(),
-    )
-
-
-@pytest.fixture
-def mock_failed_server_status_response(sample_failed_server_status) -> Response:
-    """Mock HTTP response for failed server status endpoint."""
-    return Response(
-        status_code=200,
-        json=sample_failed_server_status,
-        request=Mock(),
-    )
 
+@pytest.fixture(scope="session")
+def make_response():
+    """Factory for canned mcpproxy API responses.
 
-@pytest.fixture
-def mock_tools_list_response(sample_tool_list) -> Response:
-    """Mock HTTP response for tools list endpoint."""
-    return Response(
-        status_code=200,
-        json={"tools": sample_tool_list},
-        request=Mock(),
-    )
+    Frozen session payloads (the sample_* fixtures) are JSON-encoded once and
+    the bytes reused by every later response built from them.
 
+    Example:
+        mock_httpx_client.get.return_value = make_response(500, {"error": "boom"})
+    """
+    # id(payload) -> (payload, body); holding the payload keeps its id unique
+    bodies: Dict[int, Tuple[Any, bytes]] = {}
 
-@pytest.fixture
-def mock_error_response() -> Response:
-    """Mock HTTP error response."""
-    return Response(
-        status_code=500,
-        json={"error": "Internal server error", "message": "Something went wrong"},
-        request=Mock(),
-    )
+    def _make_response(status_code: int, payload: Any = None) -> Response:
+        if not isinstance(payload, (MappingProxyType, tuple)):
+            return Response(status_code=status_code, json=payload, request=_FAKE_REQUEST)
 
+        cached = bodies.get(id(payload))
+        if cached is None:
+            cached = bodies[id(payload)] = (payload, json.dumps(payload, default=dict).encode())
+        return Response(
+            status_code=status_code,
+            content=cached[1],
+            headers=_JSON_HEADERS,
+            request=_FAKE_REQUEST,
+        )
 
-@pytest.fixture
-def mock_auth_error_response() -> Response:
-    """Mock HTTP 401 authentication error response."""
-    return Response(
-        status_code=401,
-        json={"error": "Unauthorized", "message": "Invalid or expired token"},
-        request=Mock(),
-    )
+    return _make_response
 
 
 # ============================================================================
@@ -318,6 +386,20 @@ def configured_mock_client(
     return mock_mcpproxy_client
 
 
+# Ten identical read-only timeout errors, one shared mapping
+_TIMEOUT_ERROR_LOGS = (
+    _freeze(
+        {
+            "timestamp": "2025-11-01T10:05:00Z",
+            "level": "ERROR",
+            "server": "test-server",
+            "message": "Connection timeout after 30s",
+            "context": {"retry_count": 6},
+        }
+    ),
+) * 10
+
+
 @pytest.fixture
 def failed_server_mock_client(
     mock_mcpproxy_client,
@@ -326,16 +408,7 @@ def failed_server_mock_client(
 ):
     """MCPProxyClient mock configured for failed server scenario."""
     # Add more error logs
-    error_logs = sample_log_entries + [
-        {
-            "timestamp": "2025-11-01T10:05:00Z",
-            "level": "ERROR",
-            "server": "test-server",
-            "message": "Connection timeout after 30s",
-            "context": {"retry_count": 6},
-        }
-        for _ in range(10)
-    ]
+    error_logs = [*sample_log_entries, *_TIMEOUT_ERROR_LOGS]
 
     mock_mcpproxy_client.get_server_logs.return_value = error_logs
     mock_mcpproxy_client.get_server_status.return_value = sample_failed_server_status
@@ -348,64 +421,103 @@ def failed_server_mock_client(
 # ============================================================================
 
 
+@pytest.fixture(scope="session")
+def initial_agent_state() -> Mapping[str, Any]:
+    """Initial state for LangGraph agent, frozen all the way down."""
+    return _freeze(
+        {
+            "user_request": "Debug test-server",
+            "conversation_history": [{"role": "user", "content": "Debug test-server"}],
+            "current_task": "",
+            "task_type": "diagnose",
+            "target_server": "test-server",
+            "server_status": None,
+            "diagnostic_results": None,
+            "test_results": None,
+            "config_changes": None,
+            "suggested_fixes": [],
+            "requires_approval": False,
+            "approval_granted": False,
+            "next_action": None,
+            "error": None,
+            "completed": False,
+        }
+    )
+
+
+@pytest.fixture(scope="class")
+def make_tools_registry(class_mock_mcpproxy_client):
+    """Factory for class-scoped tools registries over canned mcpproxy data.
+
+    Example:
+        @pytest.fixture(scope="class")
+        def tools_registry(self, make_tools_registry, crash_logs):
+            return make_tools_registry(logs=crash_logs, status={...})
+    """
+
+    def _make_tools_registry(*, logs: Any, status: Mapping[str, Any]) -> Dict[str, Any]:
+        class_mock_mcpproxy_client.get_server_logs.return_value = logs
+        class_mock_mcpproxy_client.get_server_status.return_value = status
+        class_mock_mcpproxy_client.get_main_logs.return_value = logs
+        return {"diagnostic": DiagnosticTools(class_mock_mcpproxy_client)}
+
+    return _make_tools_registry
+
+
+@pytest.fixture(scope="class")
+def compiled_agent(tools_registry):
+    """Agent graph compiled once per test class.
+
+    Requires a class-scoped tools_registry fixture in the requesting class
+    or module.
+    """
+    return MCPAgentGraph(tools_registry)
+
+
 @pytest.fixture
-def initial_agent_state() -> Dict[str, Any]:
-    """Initial state for LangGraph agent."""
-    return {
-        "user_request": "Debug test-server",
-        "conversation_history": [{"role": "user", "content": "Debug test-server"}],
-        "current_task": "",
-        "task_type": "diagnose",
-        "target_server": "test-server",
-        "server_status": None,
-        "diagnostic_results": None,
-        "test_results": None,
-        "config_changes": None,
-        "suggested_fixes": [],
-        "requires_approval": False,
-        "approval_granted": False,
-        "next_action": None,
-        "error": None,
-        "completed": False,
-    }
+def agent(compiled_agent):
+    """Class-shared agent with mock calls reset.
+
+    run() starts a fresh checkpoint thread per call unless given one, so
+    no session memory carries over between tests.
+    """
+    compiled_agent.tools["diagnostic"].client.reset_mock()
+    return compiled_agent
 
 
 @pytest.fixture
 def diagnostic_state_with_results(initial_agent_state, sample_server_status) -> Dict[str, Any]:
     """Agent state after diagnostic analysis."""
-    state = initial_agent_state.copy()
-    state.update(
-        {
-            "current_task": "Diagnosing server issues",
-            "server_status": sample_server_status,
-            "diagnostic_results": {
-                "log_analysis": {
-                    "server_name": "test-server",
-                    "total_entries": 100,
-                    "error_count": 15,
-                    "warning_count": 30,
-                    "patterns": [
-                        {
-                            "pattern": "Authentication failed",
-                            "occurrences": 10,
-                            "severity": "high",
-                        }
-                    ],
-                    "recommendations": ["Re-authenticate with OAuth provider"],
-                    "critical_issues": [],
-                },
-                "connection_status": {
-                    "server_name": "test-server",
-                    "is_connected": True,
-                    "connection_state": "Ready",
-                    "last_error": None,
-                    "retry_count": 0,
-                    "suggestions": [],
-                },
+    return {
+        **initial_agent_state,
+        "current_task": "Diagnosing server issues",
+        "server_status": sample_server_status,
+        "diagnostic_results": {
+            "log_analysis": {
+                "server_name": "test-server",
+                "total_entries": 100,
+                "error_count": 15,
+                "warning_count": 30,
+                "patterns": [
+                    {
+                        "pattern": "Authentication failed",
+                        "occurrences": 10,
+                        "severity": "high",
+                    }
+                ],
+                "recommendations": ["Re-authenticate with OAuth provider"],
+                "critical_issues": [],
             },
-        }
-    )
-    return state
+            "connection_status": {
+                "server_name": "test-server",
+                "is_connected": True,
+                "connection_state": "Ready",
+                "last_error": None,
+                "retry_count": 0,
+                "suggestions": [],
+            },
+        },
+    }
 
 
 # ============================================================================
@@ -425,8 +537,6 @@ def mock_datetime():
 @pytest.fixture
 def capture_logs(caplog):
     """Fixture to capture and analyze logs."""
-    import logging
-
     caplog.set_level(logging.DEBUG)
     return caplog
 
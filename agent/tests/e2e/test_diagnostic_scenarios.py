@@ -15,13 +15,24 @@ Usage:
     pytest tests/e2e/test_diagnostic_scenarios.py::TestOAuthFailureScenario -v
 """
 
-from typing import Dict
-from unittest.mock import AsyncMock, Mock
+from types import MappingProxyType
 
 import pytest
 
-from mcp_agent.graph.agent_graph import AgentInput, MCPAgentGraph
-from mcp_agent.tools.diagnostic import DiagnosticTools
+from mcp_agent.graph.agent_graph import AgentInput
+
+_LOG_TIMESTAMPS = tuple(f"2025-11-01T10:{i:02d}:00Z" for i in range(100))
+
+# Repeated by reference in oauth_failure_logs; read-only so no test can
+# change every copy at once
+_OAUTH_EXPIRED_LOG = MappingProxyType(
+    {
+        "timestamp": "2025-11-01T10:00:00Z",
+        "level": "ERROR",
+        "message": "OAuth token expired",
+        "server": "github-server",
+    }
+)
 
 
 # ============================================================================
@@ -34,20 +45,12 @@ from mcp_agent.tools.diagnostic import DiagnosticTools
 class TestOAuthFailureScenario:
     """Test complete OAuth failure diagnostic and fix workflow."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def oauth_failure_logs(self):
         """Logs showing OAuth token expiration."""
-        return [
-            {
-                "timestamp": "2025-11-01T10:00:00Z",
-                "level": "ERROR",
-                "message": "OAuth token expired",
-                "server": "github-server",
-            }
-            for _ in range(10)
-        ]
+        return (_OAUTH_EXPIRED_LOG,) * 10
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def oauth_failure_status(self):
         """Server status showing OAuth failure."""
         return {
@@ -58,26 +61,19 @@ class TestOAuthFailureScenario:
             "retry_count": 5,
         }
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def tools_registry(
         self,
-        mock_mcpproxy_client,
+        make_tools_registry,
         oauth_failure_logs,
         oauth_failure_status,
     ):
         """Create tools registry with OAuth failure scenario."""
-        mock_mcpproxy_client.get_server_logs.return_value = oauth_failure_logs
-        mock_mcpproxy_client.get_server_status.return_value = oauth_failure_status
-
-        return {
-            "diagnostic": DiagnosticTools(mock_mcpproxy_client),
-        }
+        return make_tools_registry(logs=oauth_failure_logs, status=oauth_failure_status)
 
     @pytest.mark.asyncio
-    async def test_oauth_failure_complete_workflow(self, tools_registry):
+    async def test_oauth_failure_complete_workflow(self, agent):
         """Test complete OAuth failure diagnostic workflow."""
-        agent = MCPAgentGraph(tools_registry)
-
         # User request
         user_input = AgentInput(
             request="GitHub server is not working, can you help?",
@@ -106,50 +102,35 @@ class TestOAuthFailureScenario:
 class TestHighErrorRateScenario:
     """Test diagnostic workflow for server with high error rate."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def high_error_logs(self):
         """Logs showing high error rate."""
-        logs = []
-        for i in range(100):
-            if i % 3 == 0:  # 33% error rate
-                logs.append(
-                    {
-                        "timestamp": f"2025-11-01T10:{i:02d}:00Z",
-                        "level": "ERROR",
-                        "message": "Connection timeout",
-                        "server": "slow-server",
-                    }
-                )
-            else:
-                logs.append(
-                    {
-                        "timestamp": f"2025-11-01T10:{i:02d}:00Z",
-                        "level": "INFO",
-                        "message": "Request processed",
-                        "server": "slow-server",
-                    }
-                )
-        return logs
-
-    @pytest.fixture
-    def tools_registry(self, mock_mcpproxy_client, high_error_logs):
-        """Create tools registry with high error scenario."""
-        mock_mcpproxy_client.get_server_logs.return_value = high_error_logs
-        mock_mcpproxy_client.get_server_status.return_value = {
-            "name": "slow-server",
-            "state": "Ready",
-            "is_connected": True,
-        }
+        # 33% error rate
+        return tuple(
+            {
+                "timestamp": timestamp,
+                "level": "ERROR" if i % 3 == 0 else "INFO",
+                "message": "Connection timeout" if i % 3 == 0 else "Request processed",
+                "server": "slow-server",
+            }
+            for i, timestamp in enumerate(_LOG_TIMESTAMPS)
+        )
 
-        return {
-            "diagnostic": DiagnosticTools(mock_mcpproxy_client),
-        }
+    @pytest.fixture(scope="class")
+    def tools_registry(self, make_tools_registry, high_error_logs):
+        """Create tools registry with high error scenario."""
+        return make_tools_registry(
+            logs=high_error_logs,
+            status={
+                "name": "slow-server",
+                "state": "Ready",
+                "is_connected": True,
+            },
+        )
 
     @pytest.mark.asyncio
-    async def test_high_error_rate_detection(self, tools_registry):
+    async def test_high_error_rate_detection(self, agent):
         """Test that high error rate is detected and reported."""
-        agent = MCPAgentGraph(tools_registry)
-
         user_input = AgentInput(
             request="Analyze slow-server performance",
             server_name="slow-server",
@@ -167,7 +148,7 @@ class TestHighErrorRateScenario:
 class TestCriticalServerCrashScenario:
     """Test diagnostic workflow for critical server crash."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def crash_logs(self):
         """Logs showing server crash."""
         return [
@@ -185,26 +166,22 @@ class TestCriticalServerCrashScenario:
             },
         ]
 
-    @pytest.fixture
-    def tools_registry(self, mock_mcpproxy_client, crash_logs):
+    @pytest.fixture(scope="class")
+    def tools_registry(self, make_tools_registry, crash_logs):
         """Create tools registry with crash scenario."""
-        mock_mcpproxy_client.get_server_logs.return_value = crash_logs
-        mock_mcpproxy_client.get_server_status.return_value = {
-            "name": "crash-server",
-            "state": "Error",
-            "is_connected": False,
-            "last_error": "Server crashed",
-        }
-
-        return {
-            "diagnostic": DiagnosticTools(mock_mcpproxy_client),
-        }
+        return make_tools_registry(
+            logs=crash_logs,
+            status={
+                "name": "crash-server",
+                "state": "Error",
+                "is_connected": False,
+                "last_error": "Server crashed",
+            },
+        )
 
     @pytest.mark.asyncio
-    async def test_critical_crash_detection(self, tools_registry):
+    async def test_critical_crash_detection(self, agent):
         """Test that critical crashes are detected and prioritized."""
-        agent = MCPAgentGraph(tools_registry)
-
         user_input = AgentInput(
             request="What happened to crash-server?",
             server_name="crash-server",
@@ -233,31 +210,16 @@ class TestRealAPIIntegration:
     """
 
     @pytest.mark.asyncio
-    async def test_real_server_status_retrieval(self):
+    async def test_real_server_status_retrieval(self, mcpproxy_api_client):
         """Test retrieving real server status from API."""
-        from mcp_agent.tools.diagnostic import MCPProxyClient
-
-        client = MCPProxyClient(base_url="http://localhost:8080")
-
-        try:
-            # This will fail if API is not running
-            status = await client.get_server_status("test-server")
-            assert status is not None
-        except Exception as e:
-            pytest.skip(f"API not available: {e}")
+        status = await mcpproxy_api_client.get_server_status("test-server")
+        assert status is not None
 
     @pytest.mark.asyncio
-    async def test_real_logs_retrieval(self):
+    async def test_real_logs_retrieval(self, mcpproxy_api_client):
         """Test retrieving real logs from API."""
-        from mcp_agent.tools.diagnostic import MCPProxyClient
-
-        client = MCPProxyClient(base_url="http://localhost:8080")
-
-        try:
-            logs = await client.get_main_logs(lines=10)
-            assert isinstance(logs, list)
-        except Exception as e:
-            pytest.skip(f"API not available: {e}")
+        logs = await mcpproxy_api_client.get_main_logs(lines=10)
+        assert isinstance(logs, list)
 
 
 # ============================================================================
@@ -270,18 +232,14 @@ class TestRealAPIIntegration:
 class TestMultiServerDiagnostic:
     """Test diagnostic workflows involving multiple servers."""
 
+    @pytest.fixture(scope="class")
+    def tools_registry(self, make_tools_registry, sample_log_entries, sample_server_status):
+        """Create tools registry with default responses."""
+        return make_tools_registry(logs=sample_log_entries, status=sample_server_status)
+
     @pytest.mark.asyncio
-    async def test_diagnose_without_server_name(
-        self,
-        configured_mock_client,
-    ):
+    async def test_diagnose_without_server_name(self, agent):
         """Test diagnostic request without specifying server."""
-        tools_registry = {
-            "diagnostic": DiagnosticTools(configured_mock_client),
-        }
-
-        agent = MCPAgentGraph(tools_registry)
-
         user_input = AgentInput(
             request="Check all servers for issues",
             server_name=None,  # No specific server
@@ -304,30 +262,26 @@ class TestMultiServerDiagnostic:
 class TestApprovalWorkflow:
     """Test scenarios requiring user approval."""
 
-    @pytest.fixture
-    def tools_registry(self, mock_mcpproxy_client):
+    @pytest.fixture(scope="class")
+    def tools_registry(self, make_tools_registry):
         """Create tools registry."""
-        mock_mcpproxy_client.get_server_logs.return_value = [
-            {
-                "level": "ERROR",
-                "message": "OAuth token expired",
-            }
-        ]
-        mock_mcpproxy_client.get_server_status.return_value = {
-            "name": "test-server",
-            "state": "Error",
-            "is_connected": False,
-        }
-
-        return {
-            "diagnostic": DiagnosticTools(mock_mcpproxy_client),
-        }
+        return make_tools_registry(
+            logs=[
+                {
+                    "level": "ERROR",
+                    "message": "OAuth token expired",
+                }
+            ],
+            status={
+                "name": "test-server",
+                "state": "Error",
+                "is_connected": False,
+            },
+        )
 
     @pytest.mark.asyncio
-    async def test_workflow_with_approval_required(self, tools_registry):
+    async def test_workflow_with_approval_required(self, agent):
         """Test workflow that requires user approval."""
-        agent = MCPAgentGraph(tools_registry)
-
         user_input = AgentInput(
             request="Fix test-server",
             server_name="test-server",
@@ -341,10 +295,8 @@ class TestApprovalWorkflow:
         assert result.response is not None
 
     @pytest.mark.asyncio
-    async def test_workflow_with_auto_approve(self, tools_registry):
+    async def test_workflow_with_auto_approve(self, agent):
         """Test workflow with auto-approval enabled."""
-        agent = MCPAgentGraph(tools_registry)
-
         user_input = AgentInput(
             request="Fix test-server",
             server_name="test-server",
@@ -14,7 +14,6 @@ Usage:
     pytest tests/integration/test_agent_workflow.py::TestAgentDiagnosticWorkflow -v
 """
 
-from typing import Any, Dict
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
@@ -22,10 +21,16 @@ import pytest
 from mcp_agent.graph.agent_graph import (
     AgentInput,
     AgentOutput,
-    AgentState,
-    MCPAgentGraph,
+    HISTORY_MAX_TOKENS,
+    _append_history,
+    _merge_results,
 )
-from mcp_agent.tools.diagnostic import DiagnosticTools
+
+
+@pytest.fixture(scope="class")
+def tools_registry(make_tools_registry, sample_log_entries, sample_server_status):
+    """Create tools registry for agent, shared by each test class."""
+    return make_tools_registry(logs=sample_log_entries, status=sample_server_status)
 
 
 # ============================================================================
@@ -38,22 +43,13 @@ from mcp_agent.tools.diagnostic import DiagnosticTools
 class TestAgentDiagnosticWorkflow:
     """Test complete diagnostic workflow through LangGraph."""
 
-    @pytest.fixture
-    def tools_registry(self, configured_mock_client):
-        """Create tools registry for agent."""
-        return {
-            "diagnostic": DiagnosticTools(configured_mock_client),
-        }
-
     @pytest.mark.asyncio
     async def test_diagnostic_workflow_success(
         self,
-        tools_registry,
+        agent,
         initial_agent_state,
     ):
         """Test successful diagnostic workflow execution."""
-        agent = MCPAgentGraph(tools_registry)
-
         user_input = AgentInput(
             request="Debug test-server that is failing",
             server_name="test-server",
@@ -71,28 +67,14 @@ class TestAgentDiagnosticWorkflow:
     @pytest.mark.asyncio
     async def test_diagnostic_workflow_analyzes_request(
         self,
-        tools_registry,
+        agent,
+        initial_agent_state,
     ):
         """Test that workflow correctly analyzes user request."""
-        agent = MCPAgentGraph(tools_registry)
-
-        # Create initial state
-        state = {
-            "user_request": "Debug test-server that is failing",
-            "conversation_history": [],
-            "current_task": "",
-            "task_type": "diagnose",
+        # Create initial state with no server picked yet
+        state = initial_agent_state | {
+            "user_request": "Debug failing requests for test-server",
             "target_server": None,
-            "server_status": None,
-            "diagnostic_results": None,
-            "test_results": None,
-            "config_changes": None,
-            "suggested_fixes": [],
-            "requires_approval": False,
-            "approval_granted": False,
-            "next_action": None,
-            "error": None,
-            "completed": False,
         }
 
         # Run analyze_request node
@@ -106,14 +88,11 @@ class TestAgentDiagnosticWorkflow:
     @pytest.mark.asyncio
     async def test_diagnostic_workflow_checks_server_status(
         self,
-        tools_registry,
+        agent,
         initial_agent_state,
     ):
         """Test that workflow checks server status."""
-        agent = MCPAgentGraph(tools_registry)
-
-        state = initial_agent_state.copy()
-        state["target_server"] = "test-server"
+        state = initial_agent_state | {"target_server": "test-server"}
 
         # Run check_server_status node
         updated_state = await agent._check_server_status(state)
@@ -125,33 +104,52 @@ class TestAgentDiagnosticWorkflow:
     @pytest.mark.asyncio
     async def test_diagnostic_workflow_diagnoses_issues(
         self,
-        tools_registry,
+        agent,
         initial_agent_state,
     ):
         """Test that workflow performs diagnostic analysis."""
-        agent = MCPAgentGraph(tools_registry)
+        state = initial_agent_state | {"target_server": "test-server"}
+
+        # Run each diagnostic branch and merge them as the graph would
+        results = None
+        for node in (
+            agent._diagnose_logs,
+            agent._diagnose_connection,
+            agent._diagnose_tools,
+        ):
+            update = await node(state)
+            results = _merge_results(results, update["diagnostic_results"])
 
-        state = initial_agent_state.copy()
-        state["target_server"] = "test-server"
+        # Verify diagnostic results
+        assert results is not None
+        assert "log_analysis" in results
+        assert "connection_status" in results
+        assert "tool_analysis" in results
+
+    def test_diagnostics_fan_out_in_parallel(self, agent, initial_agent_state):
+        """Test that the diagnostic checks are dispatched as parallel branches."""
+        sends = agent._fan_out_diagnostics(initial_agent_state)
+
+        assert [send.node for send in sends] == [
+            "diagnose_logs",
+            "diagnose_connection",
+            "diagnose_tools",
+        ]
 
-        # Run diagnose node
-        updated_state = await agent._diagnose(state)
+    def test_merge_results_combines_branches(self):
+        """Test that partial diagnostic results merge and None resets them."""
+        merged = _merge_results({"log_analysis": {}}, {"tool_analysis": {}})
 
-        # Verify diagnostic results
-        assert updated_state["diagnostic_results"] is not None
-        assert "log_analysis" in updated_state["diagnostic_results"]
-        assert "connection_status" in updated_state["diagnostic_results"]
-        assert "tool_analysis" in updated_state["diagnostic_results"]
+        assert merged == {"log_analysis": {}, "tool_analysis": {}}
+        assert _merge_results(merged, None) is None
 
     @pytest.mark.asyncio
     async def test_diagnostic_workflow_suggests_fixes(
         self,
-        tools_registry,
+        agent,
         diagnostic_state_with_results,
     ):
         """Test that workflow generates fix suggestions."""
-        agent = MCPAgentGraph(tools_registry)
-
         # Run suggest_fixes node
         updated_state = await agent._suggest_fixes(diagnostic_state_with_results)
 
@@ -162,16 +160,15 @@ class TestAgentDiagnosticWorkflow:
     @pytest.mark.asyncio
     async def test_diagnostic_workflow_routing(
         self,
-        tools_registry,
+        agent,
         initial_agent_state,
     ):
         """Test that workflow routes correctly based on task type."""
-        agent = MCPAgentGraph(tools_registry)
-
         # Test diagnose route
-        state = initial_agent_state.copy()
-        state["task_type"] = "diagnose"
-        state["target_server"] = "test-server"
+        state = initial_agent_state | {
+            "task_type": "diagnose",
+            "target_server": "test-server",
+        }
 
         route = agent._route_after_analysis(state)
         assert route == "check_status"
@@ -184,35 +181,30 @@ class TestAgentDiagnosticWorkflow:
     @pytest.mark.asyncio
     async def test_diagnostic_workflow_approval_check(
         self,
-        tools_registry,
+        agent,
         diagnostic_state_with_results,
     ):
         """Test approval requirement logic."""
-        agent = MCPAgentGraph(tools_registry)
-
         # Test with fixes requiring approval
-        state = diagnostic_state_with_results.copy()
-        state["suggested_fixes"] = [
-            {"requires_approval": True, "fix_type": "authentication"}
-        ]
-        state["requires_approval"] = True
+        state = diagnostic_state_with_results | {
+            "suggested_fixes": [{"requires_approval": True, "fix_type": "authentication"}],
+            "requires_approval": True,
+        }
 
         route = agent._check_approval_needed(state)
         assert route == "needs_approval"
 
         # Test without fixes
-        state["suggested_fixes"] = []
+        state = state | {"suggested_fixes": []}
         route = agent._check_approval_needed(state)
         assert route == "report"
 
     @pytest.mark.asyncio
     async def test_diagnostic_workflow_error_handling(
         self,
-        tools_registry,
+        agent,
     ):
         """Test workflow handles errors gracefully."""
-        agent = MCPAgentGraph(tools_registry)
-
         user_input = AgentInput(
             request="Debug unknown-server",
             server_name=None,  # No server specified
@@ -223,36 +215,67 @@ class TestAgentDiagnosticWorkflow:
         result = await agent.run(user_input)
         assert isinstance(result, AgentOutput)
 
+    @pytest.mark.asyncio
+    async def test_run_batch(
+        self,
+        agent,
+    ):
+        """Test independent requests run as one batch, in input order."""
+        user_inputs = [
+            AgentInput(request="Debug unknown-server"),
+            AgentInput(request="Check settings"),
+        ]
+
+        results = await agent.run_batch(user_inputs)
+
+        assert len(results) == 2
+        assert all(isinstance(result, AgentOutput) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_run_batch_uses_fresh_threads(
+        self,
+        agent,
+    ):
+        """Test a second batch does not resume the first batch's threads."""
+        user_inputs = [AgentInput(request="Debug unknown-server")]
+
+        with patch.object(agent.graph, "abatch", AsyncMock(return_value=[])) as abatch:
+            await agent.run_batch(user_inputs)
+            await agent.run_batch(user_inputs)
+
+        first, second = (call.args[1][0] for call in abatch.await_args_list)
+        assert first["configurable"]["thread_id"] != second["configurable"]["thread_id"]
+
+    @pytest.mark.asyncio
+    async def test_run_batch_thread_ids_must_match(
+        self,
+        agent,
+    ):
+        """Test a thread ID is required for every batched request."""
+        with pytest.raises(ValueError):
+            await agent.run_batch([AgentInput(request="Debug")], thread_ids=[])
+
 
 @pytest.mark.integration
 @pytest.mark.graph
 class TestAgentStateTransitions:
     """Test LangGraph state transitions."""
 
-    @pytest.fixture
-    def tools_registry(self, configured_mock_client):
-        """Create tools registry for agent."""
-        return {
-            "diagnostic": DiagnosticTools(configured_mock_client),
-        }
-
     @pytest.mark.asyncio
     async def test_state_persists_across_nodes(
         self,
-        tools_registry,
+        agent,
         initial_agent_state,
     ):
         """Test that state is preserved across node transitions."""
-        agent = MCPAgentGraph(tools_registry)
-
         # Start with initial state
         state = initial_agent_state.copy()
 
-        # Run through multiple nodes
-        state = await agent._analyze_request(state)
+        # Run through multiple nodes, applying each partial update
+        state |= await agent._analyze_request(state)
         initial_task = state["current_task"]
 
-        state = await agent._check_server_status(state)
+        state |= await agent._check_server_status(state)
 
         # Verify state from previous node persists
         assert state["current_task"] == initial_task
@@ -261,36 +284,50 @@ class TestAgentStateTransitions:
     @pytest.mark.asyncio
     async def test_conversation_history_accumulates(
         self,
-        tools_registry,
+        agent,
+        initial_agent_state,
     ):
         """Test that conversation history accumulates correctly."""
-        agent = MCPAgentGraph(tools_registry)
-
-        state = {
+        state = initial_agent_state | {
             "user_request": "Test request",
-            "conversation_history": [
-                {"role": "user", "content": "First message"},
-            ],
-            "current_task": "",
-            "task_type": "diagnose",
-            "target_server": "test-server",
-            "server_status": None,
-            "diagnostic_results": None,
-            "test_results": None,
-            "config_changes": None,
-            "suggested_fixes": [],
-            "requires_approval": False,
-            "approval_granted": False,
-            "next_action": None,
-            "error": None,
-            "completed": False,
+            "conversation_history": [{"role": "user", "content": "First message"}],
         }
 
         # Process through workflow
-        state = await agent._analyze_request(state)
+        update = await agent._analyze_request(state)
+
+        # Nodes leave the history to the append reducer
+        assert "conversation_history" not in update
+
+    @pytest.mark.asyncio
+    async def test_conversation_history_grows_one_turn_per_run(
+        self,
+        agent,
+    ):
+        """Test that each run appends exactly its user turn to the thread."""
+        config = {"configurable": {"thread_id": "history-length"}}
+        user_input = AgentInput(request="Debug test-server", server_name="test-server")
+
+        await agent.run(user_input, thread_id="history-length")
+        history = (await agent.graph.aget_state(config)).values["conversation_history"]
+        assert len(history) == 1
 
-        # Verify history preserved
-        assert len(state["conversation_history"]) >= 1
+        await agent.run(user_input, thread_id="history-length")
+        history = (await agent.graph.aget_state(config)).values["conversation_history"]
+        assert len(history) == 2
+
+    def test_conversation_history_compacts_over_budget(self):
+        """Test that history is compacted once it exceeds the token budget."""
+        history = []
+        for i in range(50):
+            turn = {"role": "user", "content": f"Question {i} " + "x" * 400}
+            history = _append_history(history, [turn])
+
+        # Recent turns kept verbatim, older ones folded into a summary
+        assert len(history) < 50
+        assert history[-1]["content"].startswith("Question 49")
+        assert any("Context summary" in msg["content"] for msg in history)
+        assert sum(len(msg["content"]) for msg in history) // 4 <= HISTORY_MAX_TOKENS
 
 
 @pytest.mark.integration
@@ -298,21 +335,12 @@ class TestAgentStateTransitions:
 class TestAgentResponseBuilding:
     """Test agent response generation."""
 
-    @pytest.fixture
-    def tools_registry(self, configured_mock_client):
-        """Create tools registry for agent."""
-        return {
-            "diagnostic": DiagnosticTools(configured_mock_client),
-        }
-
     def test_build_response_with_diagnostic_results(
         self,
-        tools_registry,
+        agent,
         diagnostic_state_with_results,
     ):
         """Test response building with diagnostic results."""
-        agent = MCPAgentGraph(tools_registry)
-
         response = agent._build_response(diagnostic_state_with_results)
 
         # Verify response structure
@@ -323,16 +351,13 @@ class TestAgentResponseBuilding:
 
     def test_build_response_with_fixes(
         self,
-        tools_registry,
+        agent,
         diagnostic_state_with_results,
     ):
         """Test response building with suggested fixes."""
-        agent = MCPAgentGraph(tools_registry)
-
-        state = diagnostic_state_with_results.copy()
-        state["suggested_fixes"] = [
-            {"fix_type": "authentication", "requires_approval": True}
-        ]
+        state = diagnostic_state_with_results | {
+            "suggested_fixes": [{"fix_type": "authentication", "requires_approval": True}]
+        }
 
         response = agent._build_response(state)
 
@@ -341,14 +366,11 @@ class TestAgentResponseBuilding:
 
     def test_build_response_with_error(
         self,
-        tools_registry,
+        agent,
         initial_agent_state,
     ):
         """Test response building with error state."""
-        agent = MCPAgentGraph(tools_registry)
-
-        state = initial_agent_state.copy()
-        state["error"] = "Server not found"
+        state = initial_agent_state | {"error": "Server not found"}
 
         response = agent._build_response(state)
 
@@ -360,22 +382,59 @@ class TestAgentResponseBuilding:
 class TestAgentMemoryPersistence:
     """Test agent memory and state persistence."""
 
-    @pytest.fixture
-    def tools_registry(self, configured_mock_client):
-        """Create tools registry for agent."""
-        return {
-            "diagnostic": DiagnosticTools(configured_mock_client),
-        }
-
     @pytest.mark.asyncio
     async def test_memory_checkpointer_initialization(
         self,
-        tools_registry,
+        agent,
     ):
         """Test that memory checkpointer is initialized."""
-        agent = MCPAgentGraph(tools_registry)
-
         assert agent.memory is not None
 
+    @pytest.mark.asyncio
+    async def test_run_without_thread_id_uses_fresh_thread(
+        self,
+        agent,
+    ):
+        """Test that runs without a thread ID do not share checkpoint history."""
+        def thread_ids():
+            return {
+                checkpoint.config["configurable"]["thread_id"]
+                for checkpoint in agent.memory.list(None)
+            }
+
+        user_input = AgentInput(request="Debug unknown-server")
+        existing = thread_ids()
+
+        await agent.run(user_input)
+        await agent.run(user_input)
+
+        assert len(thread_ids() - existing) == 2
+
+    @pytest.mark.asyncio
+    async def test_get_latest_checkpoint_unknown_thread(
+        self,
+        agent,
+    ):
+        """Test that a thread without checkpoints has no latest checkpoint."""
+        assert await agent.get_latest_checkpoint("no-such-thread") is None
+
+    @pytest.mark.asyncio
+    async def test_get_latest_checkpoint_fetches_head_only(
+        self,
+        agent,
+    ):
+        """Test that only the head checkpoint is fetched for a thread."""
+        latest = Mock()
+
+        with patch.object(
+            agent.memory, "aget_tuple", AsyncMock(return_value=latest)
+        ) as aget_tuple:
+            result = await agent.get_latest_checkpoint("thread-1")
+
+        assert result is latest
+        aget_tuple.assert_awaited_once_with(
+            {"configurable": {"thread_id": "thread-1"}}
+        )
+
     # Note: More comprehensive memory tests would require
     # actual database operations and are better suited for E2E tests
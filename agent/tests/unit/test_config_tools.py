@@ -3,7 +3,7 @@
 import pytest
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
-from httpx import Response
+from httpx import AsyncClient, Response
 
 from mcp_agent.tools.config import (
     ConfigTools,
@@ -19,13 +19,17 @@ from mcp_agent.tools.config import (
 @pytest.fixture
 def config_tools():
     """Create ConfigTools instance."""
-    return ConfigTools(base_url="http://localhost:8080")
+    return ConfigTools(base_url="http://localhost:8080", client=AsyncClient())
 
 
 @pytest.fixture
 def config_tools_with_token():
     """Create ConfigTools instance with API token."""
-    return ConfigTools(base_url="http://localhost:8080", api_token="test-token")
+    return ConfigTools(
+        base_url="http://localhost:8080",
+        api_token="test-token",
+        client=AsyncClient()
+    )
 
 
 @pytest.fixture
@@ -240,7 +244,8 @@ class TestReadServerConfig:
         assert config.protocol == "http"
 
         config_tools.client.get.assert_called_once_with(
-            "/api/v1/agent/servers/github-server/config"
+            "http://localhost:8080/api/v1/agent/servers/github-server/config",
+            headers={}
         )
 
     @pytest.mark.asyncio
@@ -454,8 +459,9 @@ class TestBackupConfig:
         assert len(result.servers) == 2
 
         config_tools.client.post.assert_called_once_with(
-            "/api/v1/agent/config/backup",
-            params={}
+            "http://localhost:8080/api/v1/agent/config/backup",
+            params={},
+            headers={}
         )
 
     @pytest.mark.asyncio
@@ -479,8 +485,9 @@ class TestBackupConfig:
         assert result.servers[0] == "github-server"
 
         config_tools.client.post.assert_called_once_with(
-            "/api/v1/agent/config/backup",
-            params={"server": "github-server"}
+            "http://localhost:8080/api/v1/agent/config/backup",
+            params={"server": "github-server"},
+            headers={}
         )
 
 
@@ -509,8 +516,9 @@ class TestRestoreConfig:
         assert result.requires_restart is True
 
         config_tools.client.post.assert_called_once_with(
-            "/api/v1/agent/config/restore",
-            json={"backup_id": "backup_123"}
+            "http://localhost:8080/api/v1/agent/config/restore",
+            json={"backup_id": "backup_123"},
+            headers={}
         )
 
     @pytest.mark.asyncio
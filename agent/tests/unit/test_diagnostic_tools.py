@@ -22,13 +22,8 @@ Usage:
     pytest tests/unit/test_diagnostic_tools.py --cov=mcp_agent.tools.diagnostic
 """
 
-from datetime import datetime
-from typing import Any, Dict, List
-from unittest.mock import AsyncMock, Mock, patch
-
 import httpx
 import pytest
-from httpx import Response
 
 from mcp_agent.tools.diagnostic import (
     ConnectionDiagnostic,
@@ -73,14 +68,11 @@ class TestMCPProxyClient:
         self,
         mock_httpx_client,
         sample_log_entries,
+        make_response,
     ):
         """Test successful server logs retrieval."""
         # Configure mock response
-        mock_response = Response(
-            status_code=200,
-            json=sample_log_entries,
-            request=Mock(),
-        )
+        mock_response = make_response(200, sample_log_entries)
         mock_httpx_client.get.return_value = mock_response
 
         # Create client with mocked HTTP client
@@ -91,10 +83,11 @@ class TestMCPProxyClient:
         logs = await client.get_server_logs("test-server", lines=100)
 
         # Verify
-        assert logs == sample_log_entries
+        assert logs == list(sample_log_entries)
         mock_httpx_client.get.assert_called_once_with(
-            "/api/v1/agent/servers/test-server/logs",
+            "http://localhost:8080/api/v1/agent/servers/test-server/logs",
             params={"lines": 100},
+            headers={},
         )
 
     @pytest.mark.asyncio
@@ -102,13 +95,10 @@ class TestMCPProxyClient:
         self,
         mock_httpx_client,
         sample_log_entries,
+        make_response,
     ):
         """Test server logs retrieval with filter pattern."""
-        mock_response = Response(
-            status_code=200,
-            json=sample_log_entries,
-            request=Mock(),
-        )
+        mock_response = make_response(200, sample_log_entries)
         mock_httpx_client.get.return_value = mock_response
 
         client = MCPProxyClient()
@@ -120,19 +110,21 @@ class TestMCPProxyClient:
             filter_pattern="ERROR",
         )
 
-        assert logs == sample_log_entries
+        assert logs == list(sample_log_entries)
         mock_httpx_client.get.assert_called_once_with(
-            "/api/v1/agent/servers/test-server/logs",
+            "http://localhost:8080/api/v1/agent/servers/test-server/logs",
             params={"lines": 50, "filter": "ERROR"},
+            headers={},
         )
 
     @pytest.mark.asyncio
-    async def test_get_server_logs_http_error(self, mock_httpx_client):
+    async def test_get_server_logs_http_error(self, mock_httpx_client, make_response):
         """Test server logs retrieval handles HTTP errors."""
+        error_response = make_response(500)
         mock_httpx_client.get.side_effect = httpx.HTTPStatusError(
             "500 Internal Server Error",
-            request=Mock(),
-            response=Response(status_code=500, request=Mock()),
+            request=error_response.request,
+            response=error_response,
         )
 
         client = MCPProxyClient()
@@ -146,13 +138,10 @@ class TestMCPProxyClient:
         self,
         mock_httpx_client,
         sample_server_status,
+        make_response,
     ):
         """Test successful server status retrieval."""
-        mock_response = Response(
-            status_code=200,
-            json=sample_server_status,
-            request=Mock(),
-        )
+        mock_response = make_response(200, sample_server_status)
         mock_httpx_client.get.return_value = mock_response
 
         client = MCPProxyClient()
@@ -162,7 +151,8 @@ class TestMCPProxyClient:
 
         assert status == sample_server_status
         mock_httpx_client.get.assert_called_once_with(
-            "/api/v1/agent/servers/test-server"
+            "http://localhost:8080/api/v1/agent/servers/test-server",
+            headers={},
         )
 
     @pytest.mark.asyncio
@@ -170,13 +160,10 @@ class TestMCPProxyClient:
         self,
         mock_httpx_client,
         sample_log_entries,
+        make_response,
     ):
         """Test successful main logs retrieval."""
-        mock_response = Response(
-            status_code=200,
-            json=sample_log_entries,
-            request=Mock(),
-        )
+        mock_response = make_response(200, sample_log_entries)
         mock_httpx_client.get.return_value = mock_response
 
         client = MCPProxyClient()
@@ -184,10 +171,11 @@ class TestMCPProxyClient:
 
         logs = await client.get_main_logs(lines=200)
 
-        assert logs == sample_log_entries
+        assert logs == list(sample_log_entries)
         mock_httpx_client.get.assert_called_once_with(
-            "/api/v1/agent/logs/main",
+            "http://localhost:8080/api/v1/agent/logs/main",
             params={"lines": 200},
+            headers={},
         )
 
 
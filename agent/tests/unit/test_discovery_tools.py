@@ -1,8 +1,8 @@
 """Unit tests for DiscoveryTools."""
 
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
-from httpx import Response, HTTPError, RequestError
+from unittest.mock import AsyncMock, MagicMock
+from httpx import AsyncClient, Response, HTTPError, RequestError
 
 from mcp_agent.tools.discovery import (
     DiscoveryTools,
@@ -17,7 +17,7 @@ from mcp_agent.tools.discovery import (
 @pytest.fixture
 def discovery_tools():
     """Create DiscoveryTools instance."""
-    return DiscoveryTools(base_url="http://localhost:8080")
+    return DiscoveryTools(base_url="http://localhost:8080", client=AsyncClient())
 
 
 @pytest.fixture
@@ -536,9 +536,9 @@ class TestClose:
 
     @pytest.mark.asyncio
     async def test_close(self, discovery_tools):
-        """Test closing HTTP client."""
+        """Test close leaves the injected client open for its owner."""
         discovery_tools.client.aclose = AsyncMock()
 
         await discovery_tools.close()
 
-        discovery_tools.client.aclose.assert_called_once()
+        discovery_tools.client.aclose.assert_not_called()
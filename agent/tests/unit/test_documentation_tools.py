@@ -2,7 +2,7 @@
 
 import pytest
 from unittest.mock import AsyncMock, MagicMock
-from httpx import Response, HTTPError
+from httpx import AsyncClient, Response, HTTPError
 
 from mcp_agent.tools.docs import (
     DocumentationTools,
@@ -16,7 +16,7 @@ from mcp_agent.tools.docs import (
 @pytest.fixture
 def doc_tools():
     """Create DocumentationTools instance."""
-    return DocumentationTools(base_url="http://localhost:8080")
+    return DocumentationTools(base_url="http://localhost:8080", client=AsyncClient())
 
 
 @pytest.fixture
@@ -393,9 +393,9 @@ class TestClose:
 
     @pytest.mark.asyncio
     async def test_close(self, doc_tools):
-        """Test closing HTTP client."""
+        """Test close leaves the injected client open for its owner."""
         doc_tools.client.aclose = AsyncMock()
 
         await doc_tools.close()
 
-        doc_tools.client.aclose.assert_called_once()
+        doc_tools.client.aclose.assert_not_called()
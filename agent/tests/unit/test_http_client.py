@@ -0,0 +1,101 @@
+"""Unit tests for the shared HTTP client."""
+
+import httpx
+import pytest
+
+from mcp_agent.tools import http_client
+from mcp_agent.tools.config import ConfigTools
+from mcp_agent.tools.diagnostic import MCPProxyClient
+from mcp_agent.tools.discovery import DiscoveryTools
+from mcp_agent.tools.docs import DocumentationTools
+from mcp_agent.tools.http_client import decode_json, get_http_client
+from mcp_agent.tools.logs import LogTools
+from mcp_agent.tools.startup import StartupTools
+from mcp_agent.tools.testing import TestingTools
+
+
+class TestGetHttpClient:
+    """Test shared client lifecycle."""
+
+    def test_returns_same_instance(self):
+        """Test repeated calls reuse one pooled client."""
+        assert get_http_client() is get_http_client()
+
+    def test_pool_limits(self):
+        """Test client is configured with the shared pool limits."""
+        client = get_http_client()
+
+        assert isinstance(client, httpx.AsyncClient)
+        assert client.timeout.connect == 5.0
+        assert client.timeout.read == 30.0
+        assert http_client.DEFAULT_LIMITS.max_connections == 200
+        assert http_client.DEFAULT_LIMITS.max_keepalive_connections == 100
+
+    def test_http2_enabled_when_available(self):
+        """Test HTTP/2 is offered whenever the h2 package is installed."""
+        pytest.importorskip("h2")
+
+        assert http_client.HTTP2_AVAILABLE is True
+        assert get_http_client()._transport._pool._http2 is True
+
+    @pytest.mark.asyncio
+    async def test_recreated_after_close(self):
+        """Test a closed shared client is replaced on next use."""
+        client = get_http_client()
+        await client.aclose()
+
+        new_client = get_http_client()
+
+        assert new_client is not client
+        assert not new_client.is_closed
+        assert http_client._shared_client is new_client
+
+
+class TestToolClientSharing:
+    """Test tool classes share the pooled client."""
+
+    def test_startup_tools_use_shared_client(self):
+        """Test StartupTools defaults to the shared client."""
+        assert StartupTools().client is get_http_client()
+
+    def test_testing_tools_use_shared_client(self):
+        """Test TestingTools defaults to the shared client."""
+        assert TestingTools().client is get_http_client()
+
+    @pytest.mark.parametrize(
+        "tool_class",
+        [ConfigTools, DiscoveryTools, DocumentationTools, LogTools, MCPProxyClient],
+    )
+    def test_api_tools_use_shared_client(self, tool_class):
+        """Test every mcpproxy API wrapper defaults to the shared client."""
+        assert tool_class().client is get_http_client()
+
+    def test_auth_headers_stay_per_instance(self):
+        """Test API tokens are kept off the shared client."""
+        tools = ConfigTools(api_token="secret")
+
+        assert tools.headers == {"Authorization": "Bearer secret"}
+        assert "Authorization" not in get_http_client().headers
+
+    def test_startup_tools_injected_client(self):
+        """Test StartupTools accepts an injected client."""
+        client = httpx.AsyncClient()
+
+        assert StartupTools(client=client).client is client
+
+
+class TestDecodeJson:
+    """Test response body decoding."""
+
+    def test_decodes_body(self):
+        """Test JSON bodies decode to the same value as Response.json()."""
+        response = httpx.Response(200, json={"name": "github", "tools": [1, 2]})
+
+        assert decode_json(response) == response.json()
+
+    def test_falls_back_without_orjson(self, monkeypatch):
+        """Test stdlib decoding is used when orjson is unavailable."""
+        monkeypatch.setattr(http_client, "ORJSON_AVAILABLE", False)
+        response = httpx.Response(200, json={"enabled": True})
+
+        assert decode_json(response) == {"enabled": True}
@@ -2,8 +2,7 @@
 
 import pytest
 from unittest.mock import AsyncMock, MagicMock
-from httpx import Response, HTTPError
-from datetime import datetime
+from httpx import AsyncClient, Response, HTTPError
 
 from mcp_agent.tools.logs import (
     LogTools,
@@ -16,9 +15,10 @@ from mcp_agent.tools.logs import (
 # Fixtures
 
 @pytest.fixture
-def log_tools():
+async def log_tools():
     """Create LogTools instance."""
-    return LogTools(base_url="http://localhost:8080")
+    async with AsyncClient() as client:
+        yield LogTools(base_url="http://localhost:8080", client=client)
 
 
 @pytest.fixture
@@ -526,9 +526,9 @@ class TestClose:
 
     @pytest.mark.asyncio
     async def test_close(self, log_tools):
-        """Test closing HTTP client."""
+        """Test close leaves the injected client open for its owner."""
         log_tools.client.aclose = AsyncMock()
 
         await log_tools.close()
 
-        log_tools.client.aclose.assert_called_once()
+        log_tools.client.aclose.assert_not_called()
@@ -0,0 +1,78 @@
+"""Unit tests for the semantic search API."""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("chromadb")
+pytest.importorskip("sentence_transformers")
+
+import semantic_search_api  # noqa: E402
+from mcp_agent.tools import semantic_search  # noqa: E402
+from mcp_agent.tools.semantic_search import SemanticSearchTools, ServerSummary  # noqa: E402
+
+
+class _FakeEmbeddingModel:
+    """Deterministic stand-in for SentenceTransformer."""
+
+    def __init__(self, model_name):
+        pass
+
+    def eval(self):
+        return self
+
+    def encode(self, texts, **kwargs):
+        single = isinstance(texts, str)
+        rows = [texts] if single else texts
+        embeddings = np.zeros((len(rows), 8), dtype=np.float32)
+        for i, text in enumerate(rows):
+            embeddings[i, len(text) % 8] = 1.0
+        return embeddings[0] if single else embeddings
+
+
+@pytest.fixture
+def semantic_tools(tmp_path, monkeypatch):
+    """SemanticSearchTools over a temporary ChromaDB directory."""
+    monkeypatch.setattr(semantic_search, "SentenceTransformer", _FakeEmbeddingModel)
+    semantic_search._get_shared_resources.cache_clear()
+    tools = SemanticSearchTools(data_dir=str(tmp_path))
+    monkeypatch.setattr(semantic_search_api, "semantic_tools", tools)
+    yield tools
+    semantic_search._get_shared_resources.cache_clear()
+
+
+class TestServersEtag:
+    """Test /api/servers ETags track the servers collection."""
+
+    @pytest.mark.asyncio
+    async def test_etag_changes_after_batch_index(self, semantic_tools):
+        """Test a write through index_server_summaries changes the ETag."""
+        before = await semantic_search_api._servers_etag()
+
+        semantic_tools.index_server_summaries([
+            ServerSummary(server_name="github", summary="GitHub repositories"),
+        ])
+
+        assert await semantic_search_api._servers_etag() != before
+
+    @pytest.mark.asyncio
+    async def test_etag_changes_on_same_count_update(self, semantic_tools):
+        """Test updating an existing server changes the ETag."""
+        semantic_tools.index_server_summaries([
+            ServerSummary(server_name="github", summary="GitHub repositories"),
+        ])
+        before = await semantic_search_api._servers_etag()
+
+        semantic_tools.index_server_summaries([
+            ServerSummary(server_name="github", summary="GitHub issues and PRs"),
+        ])
+
+        assert await semantic_search_api._servers_etag() != before
+
+    @pytest.mark.asyncio
+    async def test_etag_stable_without_writes(self, semantic_tools):
+        """Test the ETag is unchanged when nothing was written."""
+        assert (
+            await semantic_search_api._servers_etag()
+            == await semantic_search_api._servers_etag()
+        )
@@ -2,7 +2,7 @@
 
 import pytest
 from unittest.mock import AsyncMock, MagicMock
-from httpx import Response, HTTPError
+from httpx import AsyncClient, Response, HTTPError
 
 from mcp_agent.tools.startup import (
     StartupTools,
@@ -15,9 +15,10 @@ from mcp_agent.tools.startup import (
 # Fixtures
 
 @pytest.fixture
-def startup_tools():
-    """Create StartupTools instance."""
-    return StartupTools(base_url="http://localhost:8080")
+async def startup_tools():
+    """Create StartupTools instance with its own client so mocks don't leak."""
+    async with AsyncClient() as client:
+        yield StartupTools(base_url="http://localhost:8080", client=client)
 
 
 @pytest.fixture
@@ -461,6 +462,45 @@ class TestManageDockerServices:
         assert result["success"] is True
         assert "restarted" in result["message"].lower()
 
+    @pytest.mark.asyncio
+    async def test_status_action_reads_config_once(
+        self, startup_tools, sample_server_config
+    ):
+        """Test status action issues a single config GET."""
+        mock_config_response = AsyncMock(spec=Response)
+        mock_config_response.json.return_value = sample_server_config
+        mock_config_response.raise_for_status = MagicMock()
+
+        startup_tools.client.get = AsyncMock(return_value=mock_config_response)
+
+        result = await startup_tools.manage_docker_services(
+            "github-server",
+            "status"
+        )
+
+        assert result["success"] is True
+        assert result["status"] == "running"
+        startup_tools.client.get.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_start_action_skips_config_read(self, startup_tools):
+        """Test start action only issues the config PATCH."""
+        mock_patch_response = AsyncMock(spec=Response)
+        mock_patch_response.json.return_value = {"success": True}
+        mock_patch_response.raise_for_status = MagicMock()
+
+        startup_tools.client.get = AsyncMock()
+        startup_tools.client.patch = AsyncMock(return_value=mock_patch_response)
+
+        result = await startup_tools.manage_docker_services(
+            "github-server",
+            "start"
+        )
+
+        assert result["success"] is True
+        startup_tools.client.get.assert_not_called()
+        startup_tools.client.patch.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_action_http_error(self, startup_tools):
         """Test action with HTTP error."""
@@ -556,9 +596,9 @@ class TestClose:
 
     @pytest.mark.asyncio
     async def test_close(self, startup_tools):
-        """Test closing HTTP client."""
+        """Test close leaves the injected client open for its owner."""
         startup_tools.client.aclose = AsyncMock()
 
         await startup_tools.close()
 
-        startup_tools.client.aclose.assert_called_once()
+        startup_tools.client.aclose.assert_not_called()
@@ -1,10 +1,14 @@
 """Unit tests for TestingTools."""
 
+import asyncio
+import json
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
-from httpx import Response, HTTPError
+from httpx import AsyncClient, Response, HTTPError
 
 from mcp_agent.tools.testing import (
+    SERVER_CACHE_TTL,
     TestingTools,
     TestStatus,
     ConnectionTestResult,
@@ -16,10 +20,21 @@ from mcp_agent.tools.testing import (
 
 # Fixtures
 
+def json_response(data, status_code=200):
+    """Build a mocked httpx response carrying a JSON body."""
+    response = AsyncMock(spec=Response)
+    response.status_code = status_code
+    response.content = json.dumps(data).encode()
+    response.json = MagicMock(return_value=data)
+    response.raise_for_status = MagicMock()
+    return response
+
+
 @pytest.fixture
-def testing_tools():
-    """Create TestingTools instance."""
-    return TestingTools(base_url="http://localhost:8080")
+async def testing_tools():
+    """Create TestingTools instance with its own client so mocks don't leak."""
+    async with AsyncClient() as client:
+        yield TestingTools(base_url="http://localhost:8080", client=client)
 
 
 @pytest.fixture
@@ -232,9 +247,7 @@ class TestTestServerConnection:
     @pytest.mark.asyncio
     async def test_connection_success(self, testing_tools, sample_server_status):
         """Test successful server connection test."""
-        mock_response = AsyncMock(spec=Response)
-        mock_response.json.return_value = sample_server_status
-        mock_response.raise_for_status = MagicMock()
+        mock_response = json_response(sample_server_status)
 
         testing_tools.client.get = AsyncMock(return_value=mock_response)
 
@@ -275,9 +288,7 @@ class TestTestServerConnection:
             }
         }
 
-        mock_response = AsyncMock(spec=Response)
-        mock_response.json.return_value = disconnected_status
-        mock_response.raise_for_status = MagicMock()
+        mock_response = json_response(disconnected_status)
 
         testing_tools.client.get = AsyncMock(return_value=mock_response)
 
@@ -294,9 +305,7 @@ class TestTestToolExecution:
     @pytest.mark.asyncio
     async def test_tool_execution_success(self, testing_tools, sample_server_status):
         """Test successful tool execution test."""
-        mock_response = AsyncMock(spec=Response)
-        mock_response.json.return_value = sample_server_status
-        mock_response.raise_for_status = MagicMock()
+        mock_response = json_response(sample_server_status)
 
         testing_tools.client.get = AsyncMock(return_value=mock_response)
 
@@ -316,9 +325,7 @@ class TestTestToolExecution:
     @pytest.mark.asyncio
     async def test_tool_execution_no_args(self, testing_tools, sample_server_status):
         """Test tool execution without test arguments."""
-        mock_response = AsyncMock(spec=Response)
-        mock_response.json.return_value = sample_server_status
-        mock_response.raise_for_status = MagicMock()
+        mock_response = json_response(sample_server_status)
 
         testing_tools.client.get = AsyncMock(return_value=mock_response)
 
@@ -347,6 +354,40 @@ class TestTestToolExecution:
         assert result.error is not None
         assert "Server not found" in result.error
 
+    @pytest.mark.asyncio
+    async def test_tool_execution_reuses_connection_response(
+        self, testing_tools, sample_server_status
+    ):
+        """Test tool checks reuse the server status fetched by the connection test."""
+        mock_response = json_response(sample_server_status)
+
+        testing_tools.client.get = AsyncMock(return_value=mock_response)
+
+        await testing_tools.test_server_connection("github")
+        await testing_tools.test_tool_execution("github", "create_issue")
+        await testing_tools.test_tool_execution("github", "list_repos")
+
+        testing_tools.client.get.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_expired_responses_evicted_on_insert(
+        self, testing_tools, sample_server_status
+    ):
+        """Test storing a response drops cached entries older than the TTL."""
+        testing_tools.client.get = AsyncMock(return_value=json_response(sample_server_status))
+
+        with patch("mcp_agent.tools.testing.time.monotonic", return_value=100.0):
+            await testing_tools.test_server_connection("github")
+            await testing_tools.test_server_connection("slack")
+        assert len(testing_tools._response_cache) == 2
+
+        with patch("mcp_agent.tools.testing.time.monotonic", return_value=100.0 + SERVER_CACHE_TTL):
+            await testing_tools.test_server_connection("jira")
+
+        assert list(testing_tools._response_cache) == [
+            "http://localhost:8080/api/v1/agent/servers/jira"
+        ]
+
 
 class TestRunHealthCheck:
     """Test run_health_check method."""
@@ -365,9 +406,7 @@ class TestRunHealthCheck:
             )
 
             # Mock config check
-            mock_config_response = AsyncMock(spec=Response)
-            mock_config_response.status_code = 200
-            mock_config_response.json.return_value = sample_server_config
+            mock_config_response = json_response(sample_server_config)
 
             testing_tools.client.get = AsyncMock(return_value=mock_config_response)
 
@@ -401,6 +440,52 @@ class TestRunHealthCheck:
             assert result.healthy is False
             assert result.checks_failed > 0
 
+    @pytest.mark.asyncio
+    async def test_health_check_disconnected_fails_dependent_checks(self, testing_tools, sample_server_config):
+        """Test a disconnected server fails state, response time and tools checks."""
+        with patch.object(testing_tools, 'test_server_connection', new_callable=AsyncMock) as mock_conn:
+            mock_conn.return_value = ConnectionTestResult(
+                server_name="github-server",
+                connected=False,
+                state="Disconnected",
+                response_time_ms=12.0,
+                tool_count=5
+            )
+
+            mock_config_response = json_response(sample_server_config)
+
+            testing_tools.client.get = AsyncMock(return_value=mock_config_response)
+
+            result = await testing_tools.run_health_check("github-server")
+
+            assert result.healthy is False
+            assert result.checks_failed == 4
+            assert result.checks_passed == 1
+            assert result.details["response_time"] == "✗ Server disconnected"
+            assert result.details["tools"] == "✗ Cannot check tools"
+
+    @pytest.mark.asyncio
+    async def test_health_check_config_error(self, testing_tools):
+        """Test config fetch failure is reported alongside a healthy connection."""
+        with patch.object(testing_tools, 'test_server_connection', new_callable=AsyncMock) as mock_conn:
+            mock_conn.return_value = ConnectionTestResult(
+                server_name="github-server",
+                connected=True,
+                state="Ready",
+                response_time_ms=150.0,
+                tool_count=10
+            )
+
+            testing_tools.client.get = AsyncMock(side_effect=HTTPError("Config error"))
+
+            result = await testing_tools.run_health_check("github-server")
+
+            assert result.healthy is False
+            assert result.checks_passed == 4
+            assert result.checks_failed == 1
+            assert result.details["configuration"].startswith("✗")
+            mock_conn.assert_awaited_once_with("github-server")
+
     @pytest.mark.asyncio
     async def test_health_check_slow_response_warning(self, testing_tools, sample_server_config):
         """Test health check with slow response time warning."""
@@ -413,9 +498,7 @@ class TestRunHealthCheck:
                 tool_count=10
             )
 
-            mock_config_response = AsyncMock(spec=Response)
-            mock_config_response.status_code = 200
-            mock_config_response.json.return_value = sample_server_config
+            mock_config_response = json_response(sample_server_config)
 
             testing_tools.client.get = AsyncMock(return_value=mock_config_response)
 
@@ -436,9 +519,7 @@ class TestRunHealthCheck:
                 tool_count=0  # No tools
             )
 
-            mock_config_response = AsyncMock(spec=Response)
-            mock_config_response.status_code = 200
-            mock_config_response.json.return_value = sample_server_config
+            mock_config_response = json_response(sample_server_config)
 
             testing_tools.client.get = AsyncMock(return_value=mock_config_response)
 
@@ -464,9 +545,7 @@ class TestRunHealthCheck:
                 "quarantined": False
             }
 
-            mock_config_response = AsyncMock(spec=Response)
-            mock_config_response.status_code = 200
-            mock_config_response.json.return_value = disabled_config
+            mock_config_response = json_response(disabled_config)
 
             testing_tools.client.get = AsyncMock(return_value=mock_config_response)
 
@@ -492,9 +571,7 @@ class TestRunHealthCheck:
                 "quarantined": True
             }
 
-            mock_config_response = AsyncMock(spec=Response)
-            mock_config_response.status_code = 200
-            mock_config_response.json.return_value = quarantined_config
+            mock_config_response = json_response(quarantined_config)
 
             testing_tools.client.get = AsyncMock(return_value=mock_config_response)
 
@@ -646,6 +723,48 @@ class TestRunTestSuite:
                 assert result.failed == 1
                 assert result.errors == 1
 
+    @pytest.mark.asyncio
+    async def test_test_suite_runs_tools_concurrently(self, testing_tools):
+        """Test suite overlaps tool tests and keeps result order."""
+        with patch.object(testing_tools, 'test_server_connection', new_callable=AsyncMock) as mock_conn:
+            mock_conn.return_value = ConnectionTestResult(
+                server_name="github-server",
+                connected=True,
+                state="Ready",
+                response_time_ms=150.0,
+                tool_count=10
+            )
+
+            in_flight = 0
+            peak = 0
+
+            async def mock_tool_exec(server_name, tool_name, test_args):
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0)
+                in_flight -= 1
+                return ToolTestResult(
+                    tool_name=f"{server_name}:{tool_name}",
+                    status=TestStatus.PASSED,
+                    execution_time_ms=1.0,
+                    test_args=test_args
+                )
+
+            with patch.object(testing_tools, 'test_tool_execution', side_effect=mock_tool_exec):
+                tool_tests = [{"tool_name": f"tool{i}", "args": {}} for i in range(5)]
+
+                result = await testing_tools.run_test_suite(
+                    server_name="github-server",
+                    tool_tests=tool_tests
+                )
+
+                assert result.passed == 5
+                assert peak > 1
+                assert [r.tool_name for r in result.results] == [
+                    f"github-server:tool{i}" for i in range(5)
+                ]
+
     @pytest.mark.asyncio
     async def test_test_suite_skip_invalid_test(self, testing_tools):
         """Test suite skipping invalid test configuration."""
@@ -687,9 +806,7 @@ class TestValidateServerQuarantine:
     @pytest.mark.asyncio
     async def test_validate_not_quarantined(self, testing_tools, sample_server_config):
         """Test validation of non-quarantined server."""
-        mock_response = AsyncMock(spec=Response)
-        mock_response.json.return_value = sample_server_config
-        mock_response.raise_for_status = MagicMock()
+        mock_response = json_response(sample_server_config)
 
         testing_tools.client.get = AsyncMock(return_value=mock_response)
 
@@ -709,9 +826,7 @@ class TestValidateServerQuarantine:
             "quarantined": True
         }
 
-        mock_response = AsyncMock(spec=Response)
-        mock_response.json.return_value = quarantined_config
-        mock_response.raise_for_status = MagicMock()
+        mock_response = json_response(quarantined_config)
 
         testing_tools.client.get = AsyncMock(return_value=mock_response)
 
@@ -731,9 +846,7 @@ class TestValidateServerQuarantine:
             "quarantined": False
         }
 
-        mock_response = AsyncMock(spec=Response)
-        mock_response.json.return_value = disabled_config
-        mock_response.raise_for_status = MagicMock()
+        mock_response = json_response(disabled_config)
 
         testing_tools.client.get = AsyncMock(return_value=mock_response)
 
@@ -760,9 +873,9 @@ class TestClose:
 
     @pytest.mark.asyncio
     async def test_close(self, testing_tools):
-        """Test closing HTTP client."""
+        """Test close leaves the injected client open for its owner."""
         testing_tools.client.aclose = AsyncMock()
 
         await testing_tools.close()
 
-        testing_tools.client.aclose.assert_called_once()
+        testing_tools.client.aclose.assert_not_called()